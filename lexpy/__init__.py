@@ -1,5 +1,8 @@
 __version__ = "1.1.0"
 from lexpy.trie import Trie
+from lexpy.radix_trie import RadixTrie
 from lexpy.dawg import DAWG
+from lexpy.frozen import FrozenFSA, load
+from lexpy.parallel import ParallelLexicon
 
-__all__ = ["Trie", "DAWG"]
+__all__ = ["Trie", "RadixTrie", "DAWG", "FrozenFSA", "load", "ParallelLexicon"]
@@ -1,6 +1,38 @@
 import os
+from heapq import heappop, heappush
+from itertools import count, islice, repeat
+from operator import itemgetter
 
-from lexpy._utils import validate_expression, gen_source
+from lexpy._base.cache import QueryCache
+from lexpy._base.distance import ENGINES, UNIT_COSTS, edit_costs
+from lexpy._base.permuterm import PermutermIndex
+from lexpy._base.regex import compile_regex, compile_wildcard
+from lexpy._utils import gc_paused, gen_source
+
+
+def _page(results, limit=None, offset=0):
+    """
+    Description:
+        Returns a list of at most `limit` results after skipping the first
+        `offset`. `results` is consumed lazily, so the traversal producing
+        it stops as soon as the page is complete.
+
+    Raises:
+        :raises ValueError if `limit` or `offset` is negative
+    """
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("limit and offset cannot be negative")
+    stop = None if limit is None else offset + limit
+    return list(islice(results, offset, stop))
+
+
+# The orders of `FSA.iter_words`
+WORD_ORDERS = ("lex", "length", "insertion")
+
+
+def _frozen(mapping):
+    """Returns a hashable copy of a dict argument, used in query cache keys"""
+    return None if mapping is None else frozenset(mapping.items())
 
 
 class FSA:
@@ -9,13 +41,88 @@ class FSA:
 
     """
 
-    __slots__ = "_id", "_num_of_words", "root"
+    __slots__ = (
+        "_id",
+        "_num_of_words",
+        "_suffix_index",
+        "_query_cache",
+        "_version",
+        "root",
+    )
 
     def __init__(self, root):
         self._id = 1
         self._num_of_words = 1
+        self._suffix_index = None
+        self._query_cache = None
+        # Incremented by every mutation, see `enable_query_cache`
+        self._version = 0
         self.root = root
 
+    def _child(self, node, letter):
+        """
+        Description:
+            Returns the child of `node` reached on the edge labelled
+            `letter`, or None if there is no such edge.
+
+            The query methods below only touch nodes through `_child`,
+            `_children`, `_eow` and `_count`, so an automaton with a
+            different node representation only has to override these.
+
+        Args:
+            :arg node: A node of this automaton.
+            :arg letter (str) The edge label.
+
+        Returns:
+            :returns The child node or None
+        """
+        return node.children.get(letter)
+
+    def _children(self, node):
+        """
+        Description:
+            Returns an iterable of (letter, child) pairs for the outgoing
+            edges of `node`.
+        """
+        return node.children.items()
+
+    def _eow(self, node):
+        """
+        Description:
+            Returns True if a word ends at `node`.
+        """
+        return node.eow
+
+    def _count(self, node):
+        """
+        Description:
+            Returns the count of the word ending at `node`.
+        """
+        return node.count
+
+    def _max_count(self, node):
+        """
+        Description:
+            Returns the highest count of a word ending at `node` or below it.
+        """
+        return node.max_count
+
+    def _words_below(self, node):
+        """
+        Description:
+            Returns the number of distinct words ending at `node` or below it.
+        """
+        return node.num_of_words
+
+    def _node_id(self, node):
+        """
+        Description:
+            Returns a hashable key of `node` if nodes can be reached by more
+            than one path, or None if the automaton is a tree. The key lets
+            pattern searches remember the nodes where nothing matched.
+        """
+        return None
+
     def __contains__(self, word):
         """
         Description:
@@ -62,10 +169,10 @@ class FSA:
         if prefix is None:
             return False, None
         node = self.root
-        for i, letter in enumerate(prefix):
-            if letter in node.children:
-                node = node[letter]
-            else:
+        child = self._child
+        for letter in prefix:
+            node = child(node, letter)
+            if node is None:
                 return False, None
         return True, node
 
@@ -85,124 +192,453 @@ class FSA:
         contains, _ = self.__contains_prefix(prefix)
         return contains
 
-    @staticmethod
-    def __words_with_wildcard(node, wildcard, index, current_word="", with_count=False):
+    def _iter_subtree(self, node, letters, with_count=False):
         """
         Description:
-            Returns all the words where the wildcard pattern matches.
-            This method uses backtracking to recursively traverse nodes
-            in the DAWG for wildcard characters '?' and '*'
+            Yields every word in the sub-automaton rooted at `node` in
+            depth first order. The automaton is traversed with a stack of
+            child iterators instead of recursion, so the depth of a word is
+            not bounded by the recursion limit.
 
         Args:
-            :arg node (lexpy._base.node.FSANode): Current Node in the
-            Finite State Automaton
-
-            :arg wildcard (str) : The wildcard pattern as input
+            :arg node: The node to start from.
 
-            :arg index (int): The current index in the wildcard pattern
+            :arg letters (list): Letters of the word formed till `node`.
+            Used as a buffer during the traversal and restored at the end.
 
-            :arg current_word (str): Word formed till now
+            :arg with_count (bool): Yield (word, count) tuples.
 
         Returns:
-            :returns words(list): Returns the list of words where the wildcard
-            pattern matches.
-
+            :returns A generator of the words
         """
-        if not node or not wildcard or index < 0:
-            return []
-
-        if node.eow and index >= len(wildcard) and current_word:
-            if with_count:
-                return [(current_word, node.count)]
+        children = self._children
+        eow = self._eow
+        if letters and eow(node):
+            word = "".join(letters)
+            yield (word, self._count(node)) if with_count else word
+        stack = [iter(children(node))]
+        while stack:
+            for letter, node in stack[-1]:
+                letters.append(letter)
+                if eow(node):
+                    word = "".join(letters)
+                    yield (word, self._count(node)) if with_count else word
+                stack.append(iter(children(node)))
+                break
             else:
-                return [current_word]
+                stack.pop()
+                if stack:
+                    letters.pop()
 
-        if index >= len(wildcard):
-            return []
-
-        words = []
-        letter = wildcard[index]
-
-        if letter == "?":
-            for child in node.children:
-                child_node = node[child]
-
-                child_words = FSA.__words_with_wildcard(
-                    child_node,
-                    wildcard,
-                    index + 1,
-                    current_word + child,
-                    with_count=with_count,
-                )
-                words.extend(child_words)
+    def iter_search(self, wildcard, with_count=False):
+        """
+        Description:
+            Lazily yields the words where the wildcard pattern matches, in
+            the same order as `search`. Words are produced while the
+            automaton is traversed, so the caller can stop early and a
+            search like `iter_search('*')` needs memory proportional to the
+            length of the longest word only.
 
-        elif letter == "*":
-            words_at_current_level = FSA.__words_with_wildcard(
-                node, wildcard, index + 1, current_word, with_count=with_count
-            )
-            words.extend(words_at_current_level)
-
-            if node.children:
-                for child in node.children:
-                    child_node = node[child]
-                    child_words = FSA.__words_with_wildcard(
-                        child_node,
-                        wildcard,
-                        index,
-                        current_word + child,
-                        with_count=with_count,
-                    )
-                    words.extend(child_words)
-            elif node.eow and index == len(wildcard) - 1:
-                if with_count:
-                    return [(current_word, node.count)]
-                else:
-                    return [current_word]
+        Args:
+            :arg wildcard(str) : The wildcard pattern as input
 
-        else:
-            if letter in node.children:
-                child_node = node[letter]
-                child_words = FSA.__words_with_wildcard(
-                    child_node,
-                    wildcard,
-                    index + 1,
-                    current_word + child_node.val,
-                    with_count=with_count,
-                )
-                words.extend(child_words)
+            :arg with_count(bool) : Yield (word, count) tuples
 
-        return words
+        Returns:
+            :returns A generator of the matching words
+        """
+        if not wildcard:
+            return iter(())
+        wildcard, dfa = compile_wildcard(wildcard)
+        if self._suffix_index is not None and wildcard.startswith("*"):
+            words = self._suffix_index.search(wildcard)
+            if words is not None:
+                return self._iter_words_of(words, with_count)
+        return self._iter_regex(dfa, with_count=with_count)
 
-    def search(self, wildcard, with_count=False):
+    def search(self, wildcard, with_count=False, limit=None, offset=0):
         """
         Description:
-            Returns all the words where the wildcard pattern matches.
+            Returns all the words where the wildcard pattern matches, each
+            once, in depth first order. The pattern is compiled into a DFA
+            which is cached, see `compile_wildcard`. If the suffix index is
+            built, the words matching a pattern starting with '*' are found
+            with it instead of a traversal of the whole automaton.
 
         Args:
             :arg wildcard(str) : The wildcard pattern as input
 
+            :arg limit(int) : Maximum number of words to return. The
+            search stops as soon as enough words are found.
+
+            :arg offset(int) : Number of matching words to skip.
+
         Returns:
             :returns words(list): Returns the list of words where
             the wildcard pattern matches.
 
         """
-        if not wildcard:
-            return []
-        wildcard = validate_expression(wildcard)
-        return FSA.__words_with_wildcard(
-            self.root, wildcard, 0, self.root.val, with_count=with_count
+        return self._cached(
+            ("search", wildcard, with_count, limit, offset),
+            lambda: _page(self.iter_search(wildcard, with_count), limit, offset),
+        )
+
+    def _iter_regex(self, dfa, with_count=False):
+        """
+        Description:
+            Yields the words accepted by `dfa`, a `RegexDFA`, walking the
+            automaton and the DFA together. The sub-automaton below a node
+            is skipped as soon as the DFA state dies, a state with a single
+            letter leading out of it follows that edge only and the words
+            below a universal state are enumerated directly.
+
+            When nodes are shared, as in a DAWG, the (node, state) pairs
+            below which nothing matched are remembered and not explored
+            again from another path.
+        """
+        child = self._child
+        children = self._children
+        eow = self._eow
+        step = dfa.step
+        accepting = dfa.accepting
+        literal = dfa.literal
+        universal = dfa.universal
+        node_id = self._node_id
+        dead = None if node_id(self.root) is None else set()
+
+        def edges(node, state):
+            letter = literal[state]
+            if letter is None:
+                return iter(children(node))
+            node = child(node, letter) if letter else None
+            return iter(() if node is None else ((letter, node),))
+
+        if universal[dfa.start]:
+            yield from self._iter_subtree(self.root, [], with_count)
+            return
+        letters = []
+        found = 0
+        stack = [(edges(self.root, dfa.start), dfa.start, self.root, found)]
+        while stack:
+            frame, state, node, mark = stack[-1]
+            edge = next(frame, None)
+            if edge is None:
+                stack.pop()
+                if dead is not None and found == mark:
+                    dead.add((node_id(node), state))
+                continue
+            letter, node = edge
+            depth = len(stack)
+            del letters[depth - 1 :]
+            letters.append(letter)
+
+            state = step(state, letter)
+            if state is None:
+                continue
+            if universal[state]:
+                for word in self._iter_subtree(node, letters, with_count):
+                    found += 1
+                    yield word
+                continue
+            if dead is not None and (node_id(node), state) in dead:
+                continue
+            mark = found
+            if accepting[state] and eow(node):
+                found += 1
+                word = "".join(letters)
+                yield (word, self._count(node)) if with_count else word
+            stack.append((edges(node, state), state, node, mark))
+
+    def iter_search_regex(self, pattern, with_count=False):
+        """
+        Description:
+            Lazily yields the words matching the regular expression, in the
+            same order as `search_regex`.
+
+        Args:
+            :arg pattern (str) : The regular expression
+
+            :arg with_count (bool) : Yield (word, count) tuples
+
+        Returns:
+            :returns A generator of the matching words
+
+        Raises:
+            :raises InvalidRegularExpressionError if the pattern is not
+            valid or not supported.
+        """
+        return self._iter_regex(compile_regex(pattern), with_count=with_count)
+
+    def search_regex(self, pattern, with_count=False, limit=None, offset=0):
+        """
+        Description:
+            Returns the words matching a regular expression as a whole. The
+            expression is compiled into a lazily built DFA which is walked
+            together with the automaton, so a branch is pruned as soon as no
+            word below it can match instead of testing every word.
+
+            The supported subset is literals, escaped special characters,
+            '.', character classes like '[a-z]' and '[^aeiou]', '\\d', '\\w',
+            '\\s' and their negations, the quantifiers '?', '*', '+', '{m}',
+            '{m,}' and '{m,n}', alternation with '|' and groups.
+
+        Args:
+            :arg pattern (str) : The regular expression
+
+            :arg with_count (bool) : Return (word, count) tuples
+
+            :arg limit (int) : Maximum number of words to return.
+
+            :arg offset (int) : Number of matching words to skip.
+
+        Returns:
+            :returns words (list): The matching words
+
+        Raises:
+            :raises InvalidRegularExpressionError if the pattern is not
+            valid or not supported.
+
+        Example:
+            >>> from lexpy import Trie
+            >>> trie = Trie()
+            >>> trie.add_all(['tap', 'taps', 'top', 'tops', 'trip'])
+            >>> trie.search_regex('t[ao]ps?')
+            ['tap', 'taps', 'top', 'tops']
+        """
+        words = self.iter_search_regex(pattern, with_count=with_count)
+        return _page(words, limit, offset)
+
+    def build_suffix_index(self):
+        """
+        Description:
+            Builds a permuterm index of the words, which answers
+            `search_with_suffix`, `search_with_substring` and wildcard
+            patterns starting with '*' in time proportional to the number of
+            matches instead of traversing the whole automaton. Words added
+            or removed afterwards are added to or removed from the index.
+            The index stores every rotation of every word, so it needs
+            memory proportional to the sum of the squared word lengths.
+
+        Example:
+            >>> from lexpy import Trie
+            >>> trie = Trie()
+            >>> trie.add_all(['action', 'nation', 'cat', 'scatter'])
+            >>> trie.build_suffix_index()
+            >>> trie.search('*tion')
+            ['action', 'nation']
+        """
+        self._suffix_index = PermutermIndex(self._iter_subtree(self.root, []))
+        self._version += 1
+
+    def drop_suffix_index(self):
+        """
+        Description:
+            Drops the suffix index built by `build_suffix_index`.
+        """
+        self._suffix_index = None
+        self._version += 1
+
+    def enable_query_cache(self, maxsize=1024):
+        """
+        Description:
+            Caches the results of `search`, `search_with_prefix` and
+            `search_within_distance`, keeping the `maxsize` most recently
+            used ones. A cached result is keyed on the method and all its
+            arguments. Adding, removing or reducing invalidates the whole
+            cache, so it pays off when the same queries repeat between
+            updates.
+
+        Args:
+            :arg maxsize (int) The maximum number of cached results.
+            Default is 1024.
+
+        Raises:
+            :raises ValueError if `maxsize` is less than 1
+
+        Example:
+            >>> from lexpy import Trie
+            >>> trie = Trie()
+            >>> trie.add_all(['ash', 'ashley'])
+            >>> trie.enable_query_cache(maxsize=100)
+            >>> trie.search_with_prefix('as')
+            ['ash', 'ashley']
+            >>> trie.search_with_prefix('as')
+            ['ash', 'ashley']
+            >>> trie.query_cache_info()
+            CacheInfo(hits=1, misses=1, maxsize=100, currsize=1)
+        """
+        self._query_cache = QueryCache(maxsize)
+
+    def disable_query_cache(self):
+        """
+        Description:
+            Drops the query cache enabled by `enable_query_cache`.
+        """
+        self._query_cache = None
+
+    def query_cache_info(self):
+        """
+        Description:
+            Returns the statistics of the query cache.
+
+        Returns:
+            :returns (lexpy._base.cache.CacheInfo) The hits, misses, maximum
+            size and current size of the cache, or None if it is disabled.
+        """
+        if self._query_cache is None:
+            return None
+        return self._query_cache.info()
+
+    def _cached(self, key, compute):
+        """
+        Description:
+            Returns the result of the query `key` from the query cache if it
+            is enabled, or else the result of `compute()`.
+        """
+        if self._query_cache is None:
+            return compute()
+        return self._query_cache.get(key, self._version, compute)
+
+    def _with_counts(self, words):
+        for word in words:
+            _, node = self.__contains_prefix(word)
+            yield word, self._count(node)
+
+    def _iter_words_of(self, words, with_count=False):
+        """
+        Description:
+            Yields the given words of the automaton in depth first order,
+            the order of `search`. The words are put in a tree of nested
+            dicts, with '' marking the end of a word, which is walked along
+            with the automaton so only the paths to the words are followed.
+        """
+        tree = {}
+        for word in words:
+            branch = tree
+            for letter in word:
+                branch = branch.setdefault(letter, {})
+            branch[""] = True
+        children = self._children
+        eow = self._eow
+        letters = []
+        stack = [(tree, iter(children(self.root)))]
+        while stack:
+            branch, frame = stack[-1]
+            for label, node in frame:
+                below = branch
+                for letter in label:
+                    below = below.get(letter)
+                    if below is None:
+                        break
+                if below is None:
+                    continue
+                letters.append(label)
+                if "" in below and eow(node):
+                    word = "".join(letters)
+                    yield (word, self._count(node)) if with_count else word
+                if len(below) > ("" in below):
+                    stack.append((below, iter(children(node))))
+                    break
+                letters.pop()
+            else:
+                stack.pop()
+                if stack:
+                    letters.pop()
+
+    def _iter_filtered(self, matches, with_count=False):
+        """
+        Description:
+            Yields the words of the automaton for which `matches` returns
+            True, in alphabetical order, when there is no suffix index.
+        """
+        words = sorted(
+            word for word in self._iter_subtree(self.root, []) if matches(word)
         )
+        return self._with_counts(words) if with_count else iter(words)
 
-    def search_with_prefix(self, prefix, with_count=False):
+    def search_with_suffix(self, suffix, with_count=False, limit=None, offset=0):
+        """
+        Description:
+            Returns the words ending with `suffix` in alphabetical order.
+            Without a suffix index, see `build_suffix_index`, every word of
+            the automaton is visited.
+
+        Arguments:
+            :arg (str) suffix: The suffix string
+
+            :arg (int) limit: Maximum number of words to return.
+
+            :arg (int) offset: Number of matching words to skip.
+
+        Returns:
+            :returns (list) words: which end with the suffix
+
+        Example:
+            >>> from lexpy import Trie
+            >>> trie = Trie()
+            >>> trie.add_all(['action', 'nation', 'cat', 'scatter'])
+            >>> trie.search_with_suffix('tion')
+            ['action', 'nation']
+        """
+        if not suffix:
+            return []
+        if self._suffix_index is not None:
+            words = self._suffix_index.with_suffix(suffix)
+            words = self._with_counts(words) if with_count else iter(words)
+        else:
+            words = self._iter_filtered(lambda word: word.endswith(suffix), with_count)
+        return _page(words, limit, offset)
+
+    def search_with_substring(self, substring, with_count=False, limit=None, offset=0):
+        """
+        Description:
+            Returns the words containing `substring` in alphabetical order.
+            Without a suffix index, see `build_suffix_index`, every word of
+            the automaton is visited.
+
+        Arguments:
+            :arg (str) substring: The substring
+
+            :arg (int) limit: Maximum number of words to return.
+
+            :arg (int) offset: Number of matching words to skip.
+
+        Returns:
+            :returns (list) words: which contain the substring
+
+        Example:
+            >>> from lexpy import Trie
+            >>> trie = Trie()
+            >>> trie.add_all(['action', 'nation', 'cat', 'scatter'])
+            >>> trie.search_with_substring('cat')
+            ['cat', 'scatter']
+        """
+        if not substring:
+            return []
+        if self._suffix_index is not None:
+            words = self._suffix_index.with_substring(substring)
+            words = self._with_counts(words) if with_count else iter(words)
+        else:
+            words = self._iter_filtered(lambda word: substring in word, with_count)
+        return _page(words, limit, offset)
+
+    def search_with_prefix(self, prefix, with_count=False, limit=None, offset=0):
         """
         Description:
             Returns a list of words which share the same prefix as passed in
-            input. The words are by default sorted in the increasing order of
-            length.
+            input, in depth first order: the letters of a node are visited
+            in insertion order for a Trie or a DAWG and in alphabetical order
+            for a FrozenFSA. Use `iter_words` for alphabetical or length
+            order.
 
         Arguments:
             :arg (str) prefix: The Prefix string
 
+            :arg (int) limit: Maximum number of words to return. The
+            search stops as soon as enough words are found.
+
+            :arg (int) offset: Number of matching words to skip.
+
         Returns:
             :returns (list) words: which share the same prefix as passed
             in input
@@ -210,16 +646,394 @@ class FSA:
         """
         if not prefix:
             return []
+        return self._cached(
+            ("search_with_prefix", prefix, with_count, limit, offset),
+            lambda: self._search_with_prefix(prefix, with_count, limit, offset),
+        )
+
+    def _search_with_prefix(self, prefix, with_count, limit, offset):
         _, node = self.__contains_prefix(prefix)
         if node is None:
+            return _page((), limit, offset)
+        words = self._iter_subtree(node, list(prefix), with_count=with_count)
+        return _page(words, limit, offset)
+
+    def iter_words(self, prefix="", order="lex", reverse=False, with_count=False):
+        """
+        Description:
+            Lazily yields the words starting with `prefix` in a given order.
+            Words are produced while the automaton is traversed, so reading
+            the first page of a huge lexicon in order costs about the size
+            of the page instead of sorting every word.
+
+        Arguments:
+            :arg (str) prefix: The prefix string. Default is '', every word.
+
+            :arg (str) order: One of
+                1. 'lex' (default): alphabetical order, a depth first
+                   traversal visiting the letters of a node in sorted order.
+                2. 'length': increasing length and alphabetical order for
+                   words of the same length, a breadth first traversal.
+                3. 'insertion': the depth first order of `search_with_prefix`.
+
+            :arg (bool) reverse: Yield the words in the reverse order. For
+            'length', the words are collected before the longest is yielded.
+
+            :arg (bool) with_count: Yield (word, count) tuples.
+
+        Returns:
+            :returns A generator of the words
+
+        Raises:
+            :raises ValueError if the order is unknown
+
+        Example:
+            >>> from lexpy import Trie
+            >>> trie = Trie()
+            >>> trie.add_all(['tops', 'tap', 'top', 'ta'])
+            >>> list(trie.iter_words('t', order='length'))
+            ['ta', 'tap', 'top', 'tops']
+            >>> list(trie.iter_words('t', reverse=True))
+            ['tops', 'top', 'tap', 'ta']
+        """
+        if order not in WORD_ORDERS:
+            raise ValueError(
+                f"Unknown order '{order}', expected one of {', '.join(WORD_ORDERS)}"
+            )
+        _, node = self.__contains_prefix(prefix)
+        if node is None:
+            return iter(())
+        if order == "length":
+            words = self._iter_by_length(node, prefix, with_count)
+            return reversed(list(words)) if reverse else words
+        if order == "insertion" and not reverse:
+            return self._iter_subtree(node, list(prefix), with_count)
+        return self._iter_ordered(node, prefix, order == "lex", reverse, with_count)
+
+    def _iter_ordered(self, node, prefix, lex, reverse, with_count):
+        """
+        Description:
+            Yields the words below `node` depth first, visiting the letters
+            of a node in sorted order if `lex`. With `reverse`, the letters
+            are visited backwards and a word is yielded after the words
+            extending it.
+        """
+        children = self._children
+        eow = self._eow
+
+        def edges(node):
+            if lex:
+                return iter(sorted(children(node), key=itemgetter(0), reverse=reverse))
+            if reverse:
+                return reversed(list(children(node)))
+            return iter(children(node))
+
+        letters = list(prefix)
+        if letters and not reverse and eow(node):
+            yield (prefix, self._count(node)) if with_count else prefix
+        stack = [(node, edges(node))]
+        while stack:
+            node, frame = stack[-1]
+            for letter, child in frame:
+                letters.append(letter)
+                if not reverse and eow(child):
+                    word = "".join(letters)
+                    yield (word, self._count(child)) if with_count else word
+                stack.append((child, edges(child)))
+                break
+            else:
+                stack.pop()
+                if letters and reverse and eow(node):
+                    word = "".join(letters)
+                    yield (word, self._count(node)) if with_count else word
+                if stack:
+                    letters.pop()
+
+    def _iter_by_length(self, node, prefix, with_count):
+        """
+        Description:
+            Yields the words below `node` breadth first, so that shorter
+            words come first. The letters of a node are visited in sorted
+            order, which keeps every level in alphabetical order.
+        """
+        children = self._children
+        eow = self._eow
+        if prefix and eow(node):
+            yield (prefix, self._count(node)) if with_count else prefix
+        level = [(prefix, node)]
+        while level:
+            next_level = []
+            for parent, node in level:
+                for letter, child in sorted(children(node), key=itemgetter(0)):
+                    word = parent + letter
+                    if eow(child):
+                        yield (word, self._count(child)) if with_count else word
+                    next_level.append((word, child))
+            level = next_level
+
+    def top_k_with_prefix(self, prefix, k, with_count=False):
+        """
+        Description:
+            Returns the `k` most frequent words which start with `prefix`,
+            in decreasing order of count. Every node records the highest
+            count below it, so the search is best-first: a priority queue
+            always expands the node or word with the highest count and
+            stops after `k` words. The cost depends on `k` and not on the
+            number of words sharing the prefix.
+
+            For a DAWG, call `reduce()` first so that the counts of the
+            last added words are recorded.
+
+        Arguments:
+            :arg (str) prefix: The Prefix string. An empty prefix ranks
+            every word.
+
+            :arg (int) k: Number of words to return.
+
+            :arg (bool) with_count: Return (word, count) tuples.
+
+        Returns:
+            :returns (list) words: The most frequent words with the prefix
+        """
+        _, node = self.__contains_prefix(prefix)
+        if node is None or k <= 0:
             return []
-        return FSA.__words_with_wildcard(node, "*", 0, prefix, with_count=with_count)
 
-    def add_all(self, source):
+        words = []
+        order = count()
+        heap = [(-self._max_count(node), next(order), prefix, node)]
+        while heap and len(words) < k:
+            priority, _, word, node = heappop(heap)
+            if node is None:
+                words.append((word, -priority) if with_count else word)
+                continue
+            if word and self._eow(node):
+                heappush(heap, (-self._count(node), next(order), word, None))
+            for letter, child in self._children(node):
+                heappush(
+                    heap, (-self._max_count(child), next(order), word + letter, child)
+                )
+        return words
+
+    def index_of(self, word):
+        """
+        Description:
+            Returns the index of `word` in the alphabetical order of the
+            distinct words of the automaton, from 0 to the number of words
+            minus 1. Every node records the number of words below it, so
+            the index is the sum of the words below the edges with a
+            smaller letter along the path of `word`, plus the words which
+            are a prefix of it. Together with `word_at`, this maps the
+            words to dense integer ids and back without storing them.
+
+            For a DAWG, call `reduce()` first so that the last added words
+            are counted.
+
+        Args:
+            :arg word (str) The word to look up.
+
+        Returns:
+            :returns (int) The index of the word
+
+        Raises:
+            :raises ValueError if the word is not in the automaton
+
+        Example:
+            >>> from lexpy import DAWG
+            >>> dawg = DAWG()
+            >>> dawg.add_all(['tap', 'taps', 'top', 'tops'])
+            >>> dawg.reduce()
+            >>> dawg.index_of('top')
+            2
+            >>> dawg.word_at(2)
+            'top'
+        """
+        eow = self._eow
+        words_below = self._words_below
+        node = self.root
+        index = 0
+        for letter in word if isinstance(word, str) else ():
+            if eow(node):
+                index += 1
+            next_node = None
+            for label, child in self._children(node):
+                if label < letter:
+                    index += words_below(child)
+                elif label == letter:
+                    next_node = child
+            if next_node is None:
+                break
+            node = next_node
+        else:
+            if word and eow(node):
+                return index
+        raise ValueError(f"{word!r} is not in the automaton")
+
+    def word_at(self, index):
+        """
+        Description:
+            Returns the word at `index` in the alphabetical order of the
+            distinct words of the automaton, the inverse of `index_of`. A
+            negative index counts from the last word.
+
+        Args:
+            :arg index (int) The index of the word.
+
+        Returns:
+            :returns (str) The word
+
+        Raises:
+            :raises IndexError if the index is out of range
+        """
+        eow = self._eow
+        words_below = self._words_below
+        node = self.root
+        if index < 0:
+            index += words_below(node)
+        if not 0 <= index < words_below(node):
+            raise IndexError("word index out of range")
+        letters = []
+        while True:
+            if letters and eow(node):
+                if index == 0:
+                    return "".join(letters)
+                index -= 1
+            for letter, child in sorted(self._children(node), key=itemgetter(0)):
+                num_of_words = words_below(child)
+                if index < num_of_words:
+                    letters.append(letter)
+                    node = child
+                    break
+                index -= num_of_words
+
+    def contains_many(self, words):
+        """
+        Description:
+            Checks the presence of every word of a batch. The batch is
+            walked in sorted order and the path of the previous word is
+            kept, so a word only walks the letters after the prefix it
+            shares with its predecessor.
+
+        Args:
+            :arg words (iterable) The words to check.
+
+        Returns:
+            :returns (list) A boolean for every word, in input order.
+        """
+        words = list(words)
+        result = [False] * len(words)
+        child = self._child
+        eow = self._eow
+
+        # path[i] is the node reached after the first i letters of `prev`
+        path = [self.root]
+        prev = ""
+        queries = [i for i, word in enumerate(words) if isinstance(word, str)]
+        for i in sorted(queries, key=words.__getitem__):
+            word = words[i]
+            common = 0
+            for a, b in zip(word, prev):
+                if a != b:
+                    break
+                common += 1
+            del path[common + 1 :]
+            node = path[-1]
+            for letter in word[len(path) - 1 :]:
+                node = child(node, letter)
+                if node is None:
+                    break
+                path.append(node)
+            else:
+                result[i] = eow(node) if word else True
+            prev = word
+        return result
+
+    def search_many(self, wildcards, with_count=False, limit=None, offset=0):
+        """
+        Description:
+            Runs `search` for every wildcard pattern of a batch. Repeated
+            patterns are searched once.
+
+        Args:
+            :arg wildcards (iterable) The wildcard patterns.
+
+            The other arguments are the same as in `search`.
+
+        Returns:
+            :returns (list) The list of words of every pattern, in input order.
+        """
+        results = {}
+        batch = []
+        for wildcard in wildcards:
+            if wildcard not in results:
+                results[wildcard] = self.search(
+                    wildcard, with_count=with_count, limit=limit, offset=offset
+                )
+            batch.append(list(results[wildcard]))
+        return batch
+
+    def search_within_distance_many(self, words, dist=0, **kwargs):
+        """
+        Description:
+            Runs `search_within_distance` for every word of a batch. Repeated
+            words are searched once.
+
+        Args:
+            :arg words (iterable) The words to compare with.
+
+            :arg dist (int) The maximum edit distance.
+
+            The keyword arguments are the same as in `search_within_distance`.
+
+        Returns:
+            :returns (list) The list of similar words of every word, in input
+            order.
+        """
+        results = {}
+        batch = []
+        for word in words:
+            if word not in results:
+                results[word] = self.search_within_distance(word, dist, **kwargs)
+            batch.append(list(results[word]))
+        return batch
+
+    def remove(self, word):
+        """
+        Description:
+            Removes `word` and its count. Nodes which no longer lead to a
+            word are deleted. To decrement the count of a word instead, add
+            it with a negative count.
+
+            Every mutable automaton implements `_discount(word, count=None)`,
+            which subtracts `count` from the count of `word`, or removes the
+            word if `count` is None or at least its count, and returns True
+            if the word was found.
+
+        Args:
+            :arg word (str) The word to remove.
+
+        Returns:
+            :returns (bool) True if the word was removed, False if it was
+            not found.
+
+        Example:
+            >>> from lexpy import Trie
+            >>> trie = Trie()
+            >>> trie.add_all(['ash', 'ashley'])
+            >>> trie.remove('ashley')
+            True
+            >>> trie.search('a*')
+            ['ash']
+        """
+        return self._discount(word)
+
+    def add_all(self, source, with_count=False):
         """
         Description:
             Add a collection of words from any of the following passed in input
-                1. File (complete path to the file) or a `File` type
+                1. File (complete path to the file, a glob pattern matching
+                   several files) or a `File` type. Files compressed with
+                   gzip, bz2, xz or zstd are decompressed while they are read
                 2. Generator
                 3. List
                 4. Set
@@ -229,18 +1043,68 @@ class FSA:
         Args:
             :arg source (list, set, tuple, Generator, File)
 
+            :arg with_count (bool) Every line of a file is `word<TAB>count`
+            and every item of any other source is a (word, count) pair.
+            Default is False.
+
         Returns:
             None
 
+        Raises:
+            IOError if the file does not exist
+
         """
-        if isinstance(source, str) and not os.path.exists(source):
-            raise IOError("File does not exists")
+        if isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+            source = gen_source(source, with_count=with_count)
+
+        if not with_count:
+            source = zip(source, repeat(1))
+        with gc_paused():
+            self._add_words(source)
 
-        if isinstance(source, str) or hasattr(source, "read"):
-            source = gen_source(source)
+    def _add_words(self, pairs):
+        """
+        Description:
+            Adds every (word, count) pair of `pairs`. Subclasses can replace
+            this loop with a faster one.
+        """
+        add = self.add
+        for word, n in pairs:
+            add(word, n)
 
-        for word in source:
-            self.add(word)
+    def freeze(self, double_array=False):
+        """
+        Description:
+            Compiles the automaton into a read-only `FrozenFSA` backed by
+            flat arrays. The frozen automaton answers the same queries
+            using a fraction of the memory. For a DAWG, call `reduce()`
+            before freezing so that the minimized graph is compiled.
+
+        Args:
+            :arg double_array (bool) Number the letters of the automaton
+            and also store the edges in a double array, so that `in`,
+            prefix walks and exact letters of wildcard patterns follow an
+            edge by index arithmetic. Default is False.
+
+        Returns:
+            :returns (lexpy.frozen.FrozenFSA) The compiled automaton
+        """
+        from lexpy.frozen import FrozenFSA
+
+        return FrozenFSA.from_fsa(self, double_array=double_array)
+
+    def save(self, path, double_array=False):
+        """
+        Description:
+            Freezes the automaton and writes it to `path` in the lexpy
+            binary format. Open the file with `lexpy.load(path)`.
+
+        Args:
+            :arg path (str) Path of the output file
+            :arg double_array (bool) Include the double array tables, see
+            `freeze`.
+        """
+        self.freeze(double_array=double_array).save(path)
 
     def get_word_count(self):
         """
@@ -252,52 +1116,130 @@ class FSA:
         """
         return max(0, self._num_of_words - 1)
 
-    def search_within_distance(self, word, dist=0, with_count=False):
-        row = list(range(len(word) + 1))
-        words = []
-        for child in self.root.children:
-            self._search_within_distance(
+    def search_within_distance(
+        self,
+        word,
+        dist=0,
+        with_count=False,
+        limit=None,
+        offset=0,
+        engine="automaton",
+        transpositions=False,
+        costs=None,
+        substitution_costs=None,
+    ):
+        """
+        Description:
+            Returns the words within edit distance `dist` of `word`. By
+            default this is the Levenshtein distance: insertions, deletions
+            and substitutions of a letter all cost 1.
+
+        Args:
+            :arg word (str) : The word to compare with.
+
+            :arg dist (int) : The maximum edit distance.
+
+            :arg with_count (bool) : Return (word, count) tuples.
+
+            :arg limit (int) : Maximum number of words to return. The
+            search stops as soon as enough words are found.
+
+            :arg offset (int) : Number of matching words to skip.
+
+            :arg engine (str) : How the distance is computed while the
+            automaton is traversed. All engines return the same words in
+            the same order.
+                1. 'dp': a full row of the edit distance table per node.
+                2. 'banded': only the `2 * dist + 1` cells of a row which
+                   can be within `dist`.
+                3. 'automaton' (default): a Levenshtein automaton built
+                   lazily from the banded rows. Nodes which reach the same
+                   state share the computation.
+
+            :arg transpositions (bool) : Count swapping two adjacent letters
+            as a single operation (optimal string alignment distance).
+
+            :arg costs (dict) : Cost of the 'insert', 'delete', 'substitute'
+            and 'transpose' operations. Missing operations cost 1. An
+            insertion is a letter of the found word missing from `word`, a
+            deletion is a letter of `word` missing from the found word.
+
+            :arg substitution_costs (dict) : Maps (letter of `word`, letter
+            of the found word) pairs to the cost of that substitution, e.g.
+            `lexpy.utils.keyboard_substitution_costs()`.
+
+        Returns:
+            :returns words(list): The similar words
+
+        Raises:
+            :raises ValueError if the engine or an operation is unknown
+        """
+        key = (
+            "search_within_distance",
+            word,
+            dist,
+            with_count,
+            limit,
+            offset,
+            engine,
+            transpositions,
+            _frozen(costs),
+            _frozen(substitution_costs),
+        )
+
+        def compute():
+            words = self._iter_within_distance(
                 word,
-                self.root.children[child],
-                child,
-                child,
-                words,
-                row,
                 dist,
                 with_count=with_count,
+                engine=engine,
+                transpositions=transpositions,
+                costs=edit_costs(costs, substitution_costs),
             )
-        return words
+            return _page(words, limit, offset)
 
-    def _search_within_distance(
-        self, word, node, letter, new_word, words, row, dist=0, with_count=False
+        return self._cached(key, compute)
+
+    def _iter_within_distance(
+        self,
+        word,
+        dist=0,
+        with_count=False,
+        engine="automaton",
+        transpositions=False,
+        costs=UNIT_COSTS,
     ):
-        cols = len(word) + 1
-        curr_row = [row[0] + 1]
-        for col in range(1, cols):
-            i = curr_row[col - 1] + 1
-            d = row[col] + 1
-            if word[col - 1] != letter:
-                r = row[col - 1] + 1
-            else:
-                r = row[col - 1]
-            curr_row.append(min(i, d, r))
-
-        if curr_row[-1] <= dist and node.eow:
-            (
-                words.append((new_word, node.count))
-                if with_count
-                else words.append(new_word)
+        """
+        Description:
+            Yields the words within edit distance `dist` of `word`.
+            The automaton is traversed depth first and the engine computes
+            a state for every visited node. The sub-automaton below a node
+            is skipped as soon as no word below it can be within `dist`.
+        """
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine '{engine}'. Use one of {', '.join(ENGINES)}"
             )
+        state, step = ENGINES[engine](word, dist, costs, transpositions)
 
-        if min(curr_row) <= dist:
-            for child_node in node.children:
-                self._search_within_distance(
-                    word,
-                    node.children[child_node],
-                    child_node,
-                    new_word + child_node,
-                    words,
-                    curr_row,
-                    dist,
-                    with_count=with_count,
-                )
+        children = self._children
+        letters = []
+        stack = [(iter(children(self.root)), state)]
+        while stack:
+            frame, state = stack[-1]
+            edge = next(frame, None)
+            if edge is None:
+                stack.pop()
+                continue
+            letter, node = edge
+            depth = len(stack)
+            del letters[depth - 1 :]
+            letters.append(letter)
+
+            state, distance = step(state, letter, depth)
+            if state is None:
+                continue
+            if distance <= dist and self._eow(node):
+                new_word = "".join(letters)
+                yield (new_word, self._count(node)) if with_count else new_word
+            stack.append((iter(children(node)), state))
@@ -0,0 +1,63 @@
+from collections import OrderedDict, namedtuple
+
+__all__ = ["CacheInfo", "QueryCache"]
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class QueryCache:
+    """
+    Size bounded cache of query results, evicting the least recently used
+    result. Every result is stored with the version of the automaton it was
+    computed on and the whole cache is dropped the first time it is used
+    with another version, so a mutation invalidates it without a callback.
+
+    """
+
+    __slots__ = "maxsize", "hits", "misses", "_results", "_version"
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize should be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._version = None
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, key, version, compute):
+        """
+        Description:
+            Returns the cached result of `key` if it was computed on
+            `version`, or else calls `compute` and caches its result. A copy
+            of the result list is returned, so the caller can modify it.
+
+        Args:
+            :arg key (tuple) The query and its arguments.
+            :arg version (int) The version of the automaton.
+            :arg compute (callable) Computes the result list.
+
+        Returns:
+            :returns (list) The result of the query
+        """
+        results = self._results
+        if version != self._version:
+            results.clear()
+            self._version = version
+        result = results.get(key)
+        if result is not None:
+            results.move_to_end(key)
+            self.hits += 1
+            return list(result)
+        self.misses += 1
+        result = results[key] = compute()
+        if len(results) > self.maxsize:
+            results.popitem(last=False)
+        return list(result)
+
+    def info(self):
+        """Returns the hits, misses, maximum size and size of the cache"""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
@@ -0,0 +1,216 @@
+__all__ = ["ENGINES", "edit_costs", "dp_engine", "banded_engine", "automaton_engine"]
+
+OPERATIONS = ("insert", "delete", "substitute", "transpose")
+
+# Cost of every operation and the substitution costs of letter pairs
+UNIT_COSTS = (1, 1, 1, 1, None)
+
+
+def edit_costs(costs=None, substitution_costs=None):
+    """
+    Description:
+        Validates the edit operation costs passed to `search_within_distance`.
+
+    Args:
+        :arg costs (dict) Cost of the 'insert', 'delete', 'substitute' and
+        'transpose' operations. Missing operations cost 1. An insertion is a
+        letter of the found word missing from the query and a deletion is a
+        letter of the query missing from the found word.
+
+        :arg substitution_costs (dict) Maps (query letter, word letter) pairs
+        to the cost of substituting one for the other, overriding the
+        'substitute' cost for these pairs.
+
+    Returns:
+        :returns (tuple) (insert, delete, substitute, transpose,
+        substitution_costs)
+
+    Raises:
+        :raises ValueError if an operation is unknown or the cost of an
+        insertion or a deletion is not positive.
+    """
+    if costs is None and substitution_costs is None:
+        return UNIT_COSTS
+    costs = dict(costs or {})
+    unknown = set(costs).difference(OPERATIONS)
+    if unknown:
+        raise ValueError(
+            f"Unknown edit operations {sorted(unknown)}. "
+            f"Use one of {', '.join(OPERATIONS)}"
+        )
+    insert, delete, substitute, transpose = (costs.get(op, 1) for op in OPERATIONS)
+    if insert <= 0 or delete <= 0:
+        raise ValueError("The cost of an insertion or a deletion must be positive")
+    return insert, delete, substitute, transpose, substitution_costs or None
+
+
+def dp_engine(word, dist, costs=UNIT_COSTS, transpositions=False):
+    """
+    Description:
+        Full dynamic programming engine. For every visited node, one row of
+        the edit distance table is computed with a column for each prefix of
+        `word`. With `transpositions`, swapping two adjacent letters is a
+        single operation (optimal string alignment distance).
+
+    Args:
+        :arg word (str) The word to compare with.
+        :arg dist (int) The maximum edit distance.
+        :arg costs (tuple) The costs returned by `edit_costs`.
+        :arg transpositions (bool) Count adjacent transpositions.
+
+    Returns:
+        :returns (state, step): The state of the root and a function
+        `step(state, letter, depth)` returning the state reached on `letter`
+        and the distance to `word`. The state is None when no word below can
+        be within `dist`.
+    """
+    insert, delete, substitute, transpose, substitutions = costs
+    cols = len(word) + 1
+
+    def step(state, letter, depth):
+        row, prev_row, prev_letter = state
+        curr_row = [row[0] + insert]
+        for col in range(1, cols):
+            i = curr_row[col - 1] + delete
+            d = row[col] + insert
+            if word[col - 1] == letter:
+                r = row[col - 1]
+            elif substitutions is None:
+                r = row[col - 1] + substitute
+            else:
+                r = row[col - 1] + substitutions.get(
+                    (word[col - 1], letter), substitute
+                )
+            value = min(i, d, r)
+            if (
+                transpositions
+                and col > 1
+                and letter == word[col - 2]
+                and prev_letter == word[col - 1]
+            ):
+                value = min(value, prev_row[col - 2] + transpose)
+            curr_row.append(value)
+        if min(curr_row) > dist:
+            return None, curr_row[-1]
+        return (curr_row, row, letter), curr_row[-1]
+
+    return ([col * delete for col in range(cols)], None, None), step
+
+
+def banded_engine(word, dist, costs=UNIT_COSTS, transpositions=False):
+    """
+    Description:
+        Banded dynamic programming engine. A cell `col` of the row at depth
+        `i` costs at least `|i - col|` insertions or deletions, so only a
+        band of columns around the diagonal can hold a value within `dist`.
+        That is `2 * dist + 1` cells with unit costs. Values above `dist`
+        are clamped to `dist + 1`. A state is (first column, row, previous
+        state, letter).
+    """
+    insert, delete, substitute, transpose, substitutions = costs
+    width = int(dist // min(insert, delete))
+    m = len(word)
+    cap = dist + 1
+
+    def step(state, letter, depth):
+        prev_lo, prev, prev_state, prev_letter = state
+        lo = max(0, depth - width)
+        hi = min(m, depth + width)
+        if lo > hi:
+            return None, cap
+        curr_row = []
+        best = cap
+        for col in range(lo, hi + 1):
+            if col == 0:
+                value = depth * insert
+            else:
+                k = col - prev_lo
+                value = prev[k] + insert if k < len(prev) else cap
+                if k:
+                    if word[col - 1] == letter:
+                        r = prev[k - 1]
+                    elif substitutions is None:
+                        r = prev[k - 1] + substitute
+                    else:
+                        r = prev[k - 1] + substitutions.get(
+                            (word[col - 1], letter), substitute
+                        )
+                    if r < value:
+                        value = r
+                if curr_row and curr_row[-1] + delete < value:
+                    value = curr_row[-1] + delete
+                if (
+                    transpositions
+                    and col > 1
+                    and letter == word[col - 2]
+                    and prev_letter == word[col - 1]
+                ):
+                    k = col - 2 - prev_state[0]
+                    if 0 <= k < len(prev_state[1]):
+                        value = min(value, prev_state[1][k] + transpose)
+            if value > dist:
+                value = cap
+            curr_row.append(value)
+            if value < best:
+                best = value
+        if best > dist:
+            return None, cap
+        state = (lo, tuple(curr_row), state if transpositions else None, letter)
+        return state, (curr_row[-1] if hi == m else cap)
+
+    start = [col * delete for col in range(min(m, width) + 1)]
+    start = tuple(value if value <= dist else cap for value in start)
+    return (0, start, None, None), step
+
+
+def automaton_engine(word, dist, costs=UNIT_COSTS, transpositions=False):
+    """
+    Description:
+        Lazily built Levenshtein automaton. A banded row only depends on the
+        previous row(s), the depth and which letters of `word` inside the
+        band are equal to the new (and, for transpositions, the previous)
+        letter. Transitions are computed with the banded engine once per
+        distinct key and then looked up, so nodes sharing a state cost a
+        dictionary lookup. With a substitution matrix the letters
+        themselves are part of the key.
+    """
+    insert, delete, substitute, transpose, substitutions = costs
+    width = int(dist // min(insert, delete))
+    masks = {}
+    for i, letter in enumerate(word):
+        masks[letter] = masks.get(letter, 0) | (1 << i)
+    # Letters of `word` from two columns left of the band up to one column
+    # right of it decide this step and the transposition of the next one
+    window = (1 << (2 * width + 4)) - 1
+    start, banded_step = banded_engine(word, dist, costs, transpositions)
+    transitions = {}
+
+    def step(state, letter, depth):
+        shift = depth - width - 2
+        if substitutions is not None:
+            bits = letter
+        else:
+            bits = masks.get(letter, 0)
+            bits = (bits >> shift if shift > 0 else bits) & window
+        if transpositions:
+            prev_row = state[2] and state[2][1]
+            prev_bits = state[3]
+            if substitutions is None:
+                prev_bits = masks.get(prev_bits, 0)
+                prev_bits = (prev_bits >> shift if shift > 0 else prev_bits) & window
+            key = (depth, state[1], bits, prev_row, prev_bits)
+        else:
+            key = (depth, state[1], bits)
+        target = transitions.get(key)
+        if target is None:
+            target = transitions[key] = banded_step(state, letter, depth)
+        return target
+
+    return start, step
+
+
+ENGINES = {
+    "dp": dp_engine,
+    "banded": banded_engine,
+    "automaton": automaton_engine,
+}
@@ -6,7 +6,7 @@ class FSANode:
 
     """
 
-    __slots__ = "id", "val", "children", "eow", "count"
+    __slots__ = "id", "val", "children", "eow", "count", "max_count", "num_of_words"
 
     def __init__(self, _id, val):
         """
@@ -23,6 +23,8 @@ class FSANode:
         self.children = {}
         self.eow = False
         self.count = 0
+        self.max_count = 0
+        self.num_of_words = 0
 
     def add_child(self, letter, _id=None):
         """
@@ -34,7 +36,44 @@ class FSANode:
             :arg id (int) Unique numerical ID assigned to this node.
 
         """
-        self.children[letter] = FSANode(_id, letter)
+        self.children[letter] = self.__class__(_id, letter)
+
+    def update_max_count(self):
+        """
+        Description:
+            Recomputes `max_count`, the highest count of a word ending at
+            this node or below it, from the count of this node and the
+            `max_count` of its children. `num_of_words`, the number of words
+            ending at this node or below it, is recomputed along with it.
+        """
+        max_count = self.count if self.eow else 0
+        num_of_words = 1 if self.eow else 0
+        for child in self.children.values():
+            if child.max_count > max_count:
+                max_count = child.max_count
+            num_of_words += child.num_of_words
+        self.max_count = max_count
+        self.num_of_words = num_of_words
+
+    def signature(self):
+        """
+        Description:
+            Returns the structural signature of the node: its end of word
+            flag, count and the letter and child id of every outgoing edge
+            sorted by letter, in a single flat tuple. Two nodes with the same
+            signature accept the same words with the same counts, which is
+            what DAWG minimization looks up. It is built without creating
+            strings.
+
+        Returns:
+            :returns (tuple) The signature of the node
+        """
+        signature = [self.eow, self.count]
+        children = self.children
+        for letter in sorted(children) if len(children) > 1 else children:
+            signature.append(letter)
+            signature.append(children[letter].id)
+        return tuple(signature)
 
     def __getitem__(self, letter):
         """
@@ -75,21 +114,23 @@ class FSANode:
     def __eq__(self, other):
         """
         Description:
-            Equal only if string representations are same.
+            Equal only if the signatures are the same.
 
         :param other:
         :return: bool
         """
-        return self.__str__() == other.__str__()
+        if not isinstance(other, FSANode):
+            return NotImplemented
+        return self.signature() == other.signature()
 
     def __hash__(self):
         """
         Description:
-            Call the __hash__() method on the string representation.
+            Call the __hash__() method on the signature.
 
         :return:
         """
-        return self.__str__().__hash__()
+        return hash(self.signature())
 
     def __repr__(self):
         """
@@ -101,3 +142,228 @@ class FSANode:
         return "{0}(id={1}, label={2}, EOW={3}, count={4})".format(
             self.__class__.__name__, self.id, self.val, self.eow, self.count
         )
+
+
+class DAWGNode(FSANode):
+    """
+    Node of a Directed Acyclic Word Graph (DAWG). A minimized node can be
+    the target of several edges, counted by `refs`. A node with more than
+    one incoming edge is shared by several words and is copied before one
+    of them changes it.
+
+    """
+
+    __slots__ = ("refs",)
+
+    def __init__(self, _id, val):
+        super(DAWGNode, self).__init__(_id, val)
+        self.refs = 0
+
+    def add_child(self, letter, _id=None):
+        """
+        Description:
+            To add a child edge to the current Node.
+
+        Args:
+            :arg letter (str) The character label that the child node will have.
+            :arg id (int) Unique numerical ID assigned to this node.
+
+        """
+        child = self.__class__(_id, letter)
+        child.refs = 1
+        self.children[letter] = child
+
+
+class RadixNode(FSANode):
+    """
+    Node of a path compressed trie. The label `val` of the edge leading to
+    the node is a substring instead of a single letter, and the children
+    are keyed by the first letter of their label.
+
+    """
+
+    __slots__ = ()
+
+
+# Largest number of children kept in the arrays of a compact node
+MAX_ARRAY_CHILDREN = 16
+
+
+def _store_children(node, labels, targets):
+    """
+    Description:
+        Stores the children of a compact node in the smallest layout: no
+        children, a single (label, child) pair, a string of labels with a
+        tuple of children, or a dict when there are more than
+        `MAX_ARRAY_CHILDREN` children.
+    """
+    if not labels:
+        node._labels = ""
+        node._targets = None
+    elif len(labels) == 1:
+        node._labels = labels
+        node._targets = targets[0]
+    elif len(labels) <= MAX_ARRAY_CHILDREN:
+        node._labels = labels
+        node._targets = tuple(targets)
+    else:
+        node._labels = None
+        node._targets = dict(zip(labels, targets))
+
+
+class CompactChildren:
+    """
+    Dictionary-like view of the children of a compact node. It supports
+    the dict operations used on `FSANode.children` and keeps the children
+    in insertion order, so a compact node can replace an `FSANode`.
+
+    """
+
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def get(self, letter, default=None):
+        node = self.node
+        labels = node._labels
+        if labels is None:
+            return node._targets.get(letter, default)
+        i = labels.find(letter)
+        if i < 0:
+            return default
+        return node._targets if len(labels) == 1 else node._targets[i]
+
+    def __getitem__(self, letter):
+        child = self.get(letter)
+        if child is None:
+            raise KeyError(letter)
+        return child
+
+    def __setitem__(self, letter, child):
+        node = self.node
+        labels = node._labels
+        if labels is None:
+            node._targets[letter] = child
+            return
+        targets = list(self.values())
+        i = labels.find(letter)
+        if i < 0:
+            labels += letter
+            targets.append(child)
+        else:
+            targets[i] = child
+        _store_children(node, labels, targets)
+
+    def __delitem__(self, letter):
+        node = self.node
+        labels = node._labels
+        if labels is None:
+            targets = node._targets
+            del targets[letter]
+            if len(targets) <= MAX_ARRAY_CHILDREN:
+                _store_children(node, "".join(targets), list(targets.values()))
+            return
+        i = labels.find(letter)
+        if i < 0:
+            raise KeyError(letter)
+        targets = list(self.values())
+        del targets[i]
+        _store_children(node, labels[:i] + labels[i + 1 :], targets)
+
+    def __contains__(self, letter):
+        return self.get(letter) is not None
+
+    def __len__(self):
+        labels = self.node._labels
+        return len(self.node._targets) if labels is None else len(labels)
+
+    def __iter__(self):
+        labels = self.node._labels
+        return iter(self.node._targets if labels is None else labels)
+
+    def keys(self):
+        labels = self.node._labels
+        return self.node._targets.keys() if labels is None else labels
+
+    def values(self):
+        node = self.node
+        labels = node._labels
+        if labels is None:
+            return node._targets.values()
+        if len(labels) == 1:
+            return (node._targets,)
+        return node._targets or ()
+
+    def items(self):
+        node = self.node
+        labels = node._labels
+        if labels is None:
+            return node._targets.items()
+        if len(labels) == 1:
+            return ((labels, node._targets),)
+        return zip(labels, node._targets or ())
+
+    def __repr__(self):
+        return "{0}({1})".format(self.__class__.__name__, dict(self.items()))
+
+
+class CompactNodeMixin:
+    """
+    Stores the children of a node without a dict. A leaf holds no
+    container, a node with a single child holds the (label, child) pair and
+    a node with up to `MAX_ARRAY_CHILDREN` children holds a string of
+    labels and a tuple of children. A node with more children is promoted
+    to a dict. `children` returns a `CompactChildren` view, so `Trie`,
+    `DAWG` and `RadixTrie` use compact nodes unchanged.
+
+    Compact nodes need a fraction of the memory of a dict per node, at
+    the price of slower lookups.
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def children(self):
+        return CompactChildren(self)
+
+    @children.setter
+    def children(self, children):
+        labels = "".join(children)
+        _store_children(self, labels, [children[letter] for letter in labels])
+
+    def signature(self):
+        labels = self._labels
+        if labels is None or len(labels) > 1:
+            return super(CompactNodeMixin, self).signature()
+        if labels:
+            return self.eow, self.count, labels, self._targets.id
+        return self.eow, self.count
+
+
+class CompactFSANode(CompactNodeMixin, FSANode):
+    """
+    `FSANode` with compact storage of its children.
+
+    """
+
+    __slots__ = "_labels", "_targets"
+
+
+class CompactDAWGNode(CompactNodeMixin, DAWGNode):
+    """
+    `DAWGNode` with compact storage of its children.
+
+    """
+
+    __slots__ = "_labels", "_targets"
+
+
+class CompactRadixNode(CompactNodeMixin, RadixNode):
+    """
+    `RadixNode` with compact storage of its children.
+
+    """
+
+    __slots__ = "_labels", "_targets"
@@ -0,0 +1,151 @@
+import re
+from bisect import bisect_left
+
+__all__ = ["PermutermIndex"]
+
+# Marks the end of a word in its rotations
+TERMINATOR = "\x00"
+
+PATTERN_FOR_LITERALS = re.compile(r"[^?*]+")
+
+
+def _rotations(word):
+    word += TERMINATOR
+    return [word[i:] + word[:i] for i in range(len(word))]
+
+
+def _word_of(rotation):
+    head, _, tail = rotation.partition(TERMINATOR)
+    return tail + head
+
+
+def _wildcard_regex(wildcard):
+    """
+    Description:
+        Translates a wildcard pattern into a regular expression matching
+        the same words as `compile_wildcard`: '*' is any number of letters
+        and '?' is a single letter.
+    """
+    parts = []
+    for symbol in wildcard:
+        if symbol == "*":
+            parts.append(".*")
+        elif symbol == "?":
+            parts.append(".")
+        else:
+            parts.append(re.escape(symbol))
+    return re.compile("".join(parts), re.DOTALL)
+
+
+class PermutermIndex:
+    """
+    Permuterm index of the words of an automaton. Every word `w` is stored
+    as the rotations of `w + TERMINATOR` in a sorted list, so the words
+    containing `s` are the rotations starting with `s` and the words ending
+    with `s` are the rotations starting with `s + TERMINATOR`. A query is a
+    binary search for the range of rotations followed by a scan of the
+    range, which takes time proportional to the number of matches.
+
+    The rotations of new words go to a small sorted list of pending
+    rotations, which is searched as well and merged into the main list
+    once it holds more than 1/64 of its rotations.
+
+    """
+
+    __slots__ = "_rotations", "_pending", "_sorted"
+
+    def __init__(self, words=()):
+        self._rotations = [rotation for word in words for rotation in _rotations(word)]
+        self._rotations.sort()
+        self._pending = []
+        self._sorted = True
+
+    def __len__(self):
+        """Returns the number of rotations in the index"""
+        return len(self._rotations) + len(self._pending)
+
+    def add(self, word):
+        """
+        Description:
+            Adds the rotations of a word which is not in the index yet.
+        """
+        self._pending.extend(_rotations(word))
+        self._sorted = False
+
+    def remove(self, word):
+        """
+        Description:
+            Removes the rotations of a word of the index.
+        """
+        for rotation in _rotations(word):
+            for rotations in self._lists():
+                i = bisect_left(rotations, rotation)
+                if i < len(rotations) and rotations[i] == rotation:
+                    del rotations[i]
+                    break
+
+    def _lists(self):
+        """Returns the main and the pending lists of rotations, both sorted."""
+        if not self._sorted:
+            pending = self._pending
+            if len(pending) > len(self._rotations) // 64:
+                self._rotations.extend(pending)
+                self._rotations.sort()
+                pending.clear()
+            else:
+                pending.sort()
+            self._sorted = True
+        return self._rotations, self._pending
+
+    def _starting_with(self, prefix):
+        matches = []
+        for rotations in self._lists():
+            i = bisect_left(rotations, prefix)
+            while i < len(rotations) and rotations[i].startswith(prefix):
+                matches.append(rotations[i])
+                i += 1
+        return matches
+
+    def with_suffix(self, suffix):
+        """
+        Description:
+            Returns the words ending with `suffix` in alphabetical order.
+        """
+        rotations = self._starting_with(suffix + TERMINATOR)
+        return sorted(_word_of(rotation) for rotation in rotations)
+
+    def with_substring(self, substring):
+        """
+        Description:
+            Returns the words containing `substring` in alphabetical order.
+        """
+        rotations = self._starting_with(substring)
+        return sorted({_word_of(rotation) for rotation in rotations})
+
+    def search(self, wildcard):
+        """
+        Description:
+            Returns the words where a validated wildcard pattern starting
+            with '*' matches, in alphabetical order. The candidates are the
+            words ending with the last letters of the pattern if it ends
+            with a letter, or else the words containing its longest run of
+            letters, and they are checked against the whole pattern.
+
+        Returns:
+            :returns (list) The matching words, or None if the pattern has
+            no letters.
+        """
+        literals = PATTERN_FOR_LITERALS.findall(wildcard)
+        if not literals:
+            return None
+        if wildcard[-1] not in "?*":
+            if wildcard == "*" + literals[0]:
+                return self.with_suffix(literals[0])
+            candidates = self.with_suffix(literals[-1])
+        else:
+            longest = max(literals, key=len)
+            candidates = self.with_substring(longest)
+            if len(literals) == 1 and wildcard.endswith("*") and "?" not in wildcard:
+                return candidates
+        match = _wildcard_regex(wildcard).fullmatch
+        return [word for word in candidates if match(word)]
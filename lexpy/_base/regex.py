@@ -0,0 +1,411 @@
+from functools import lru_cache
+
+from lexpy._utils import validate_expression
+from lexpy.exceptions import InvalidRegularExpressionError
+
+__all__ = ["compile_regex", "compile_wildcard", "RegexDFA"]
+
+# Number of compiled patterns kept by `compile_regex` and `compile_wildcard`
+PATTERN_CACHE_SIZE = 256
+
+# Character class escapes, as (negated, str method)
+CLASS_ESCAPES = {
+    "d": (False, str.isdecimal),
+    "D": (True, str.isdecimal),
+    "w": (False, lambda c: c.isalnum() or c == "_"),
+    "W": (True, lambda c: c.isalnum() or c == "_"),
+    "s": (False, str.isspace),
+    "S": (True, str.isspace),
+}
+QUANTIFIERS = {"*": (0, None), "+": (1, None), "?": (0, 1)}
+LITERAL_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v"}
+
+# A label matching any letter, used for '.'
+ANY = (True, frozenset(), (), ())
+
+# Letters escaped when a wildcard pattern is translated to a regular expression
+SPECIAL = frozenset("\\.[]{}()*+?|^$")
+
+
+def _matches(label, letter):
+    """
+    Description:
+        Returns True if `letter` matches the label of an NFA edge. A label
+        is a (negated, letters, ranges, predicates) tuple.
+    """
+    negated, letters, ranges, predicates = label
+    found = (
+        letter in letters
+        or any(lo <= letter <= hi for lo, hi in ranges)
+        or any(predicate(letter) for predicate in predicates)
+    )
+    return found != negated
+
+
+class _Parser:
+    """
+    Recursive descent parser of the supported regular expression subset
+    into a tree of tuples:
+        ("set", label), ("cat", [nodes]), ("alt", [nodes]) and
+        ("repeat", node, min, max) where max is None when unbounded.
+    """
+
+    def __init__(self, pattern):
+        self.source = pattern
+        self.pattern = pattern
+        self.pos = 0
+
+    def error(self, message):
+        raise InvalidRegularExpressionError(self.source, message)
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def take(self):
+        letter = self.peek()
+        if letter is None:
+            self.error("Unexpected end of pattern")
+        self.pos += 1
+        return letter
+
+    def parse(self):
+        pattern = self.pattern
+        # Anchors are accepted at the ends only, the whole word always matches
+        if pattern.startswith("^"):
+            self.pos = 1
+        escapes = len(pattern[:-1]) - len(pattern[:-1].rstrip("\\"))
+        if pattern.endswith("$") and len(pattern) > self.pos and escapes % 2 == 0:
+            self.pattern = pattern = pattern[:-1]
+        node = self.alternation()
+        if self.pos < len(pattern):
+            self.error(f"Unexpected '{pattern[self.pos]}' at position {self.pos}")
+        return node
+
+    def alternation(self):
+        branches = [self.concatenation()]
+        while self.peek() == "|":
+            self.pos += 1
+            branches.append(self.concatenation())
+        return branches[0] if len(branches) == 1 else ("alt", branches)
+
+    def concatenation(self):
+        items = []
+        while self.peek() is not None and self.peek() not in "|)":
+            items.append(self.repetition())
+        return items[0] if len(items) == 1 else ("cat", items)
+
+    def repetition(self):
+        node = self.atom()
+        while True:
+            letter = self.peek()
+            if letter == "{":
+                bounds = self.bounds()
+                if bounds is None:
+                    return node
+            elif letter is not None and letter in QUANTIFIERS:
+                bounds = QUANTIFIERS[letter]
+                self.pos += 1
+            else:
+                return node
+            if self.peek() == "?":
+                # A lazy quantifier matches the same whole words
+                self.pos += 1
+            elif self.peek() == "+":
+                self.error("Possessive quantifiers are not supported")
+            node = ("repeat", node, *bounds)
+
+    def bounds(self):
+        """Parses '{m}', '{m,}' or '{m,n}'. Anything else is a literal '{'."""
+        close = self.pattern.find("}", self.pos)
+        if close < 0:
+            return None
+        low, comma, high = self.pattern[self.pos + 1 : close].partition(",")
+        if low and not low.isdecimal() or high and not high.isdecimal():
+            return None
+        if not low and not (comma and high):
+            return None
+        low = int(low or 0)
+        high = int(high) if high else (None if comma else low)
+        if high is not None and high < low:
+            self.error("Minimum repeat count is greater than the maximum")
+        self.pos = close + 1
+        return low, high
+
+    def atom(self):
+        letter = self.take()
+        if letter == "(":
+            if self.pattern.startswith("?:", self.pos):
+                self.pos += 2
+            elif self.peek() == "?":
+                self.error("Only non capturing groups '(?:' are supported")
+            node = self.alternation()
+            if self.peek() != ")":
+                self.error("Missing ')'")
+            self.pos += 1
+            return node
+        if letter == ".":
+            return ("set", ANY)
+        if letter == "[":
+            return ("set", self.character_class())
+        if letter == "\\":
+            return ("set", self.escape())
+        if letter in "*+?":
+            self.error(f"Nothing to repeat at position {self.pos - 1}")
+        if letter in ")^$":
+            self.error(f"Unexpected '{letter}' at position {self.pos - 1}")
+        return ("set", (False, frozenset(letter), (), ()))
+
+    def escape(self):
+        letter = self.take()
+        if letter in CLASS_ESCAPES:
+            negated, predicate = CLASS_ESCAPES[letter]
+            return (negated, frozenset(), (), (predicate,))
+        if letter in LITERAL_ESCAPES:
+            return (False, frozenset(LITERAL_ESCAPES[letter]), (), ())
+        if letter.isalnum():
+            self.error(f"Unsupported escape '\\{letter}'")
+        return (False, frozenset(letter), (), ())
+
+    def character_class(self):
+        negated = self.peek() == "^"
+        if negated:
+            self.pos += 1
+        letters = set()
+        ranges = []
+        predicates = []
+        first = True
+        while True:
+            letter = self.take()
+            if letter == "]" and not first:
+                break
+            first = False
+            if letter == "\\":
+                escaped = self.take()
+                if escaped in CLASS_ESCAPES:
+                    escaped_negated, predicate = CLASS_ESCAPES[escaped]
+                    if escaped_negated:
+                        self.error(f"Unsupported escape '\\{escaped}' in a class")
+                    predicates.append(predicate)
+                    continue
+                letter = LITERAL_ESCAPES.get(escaped, escaped)
+            if (
+                self.peek() == "-"
+                and self.pos + 1 < len(self.pattern)
+                and self.pattern[self.pos + 1] != "]"
+            ):
+                self.pos += 1
+                high = self.take()
+                if high == "\\":
+                    high = self.take()
+                    high = LITERAL_ESCAPES.get(high, high)
+                if high < letter:
+                    self.error(f"Bad character range {letter}-{high}")
+                ranges.append((letter, high))
+            else:
+                letters.add(letter)
+        return (negated, frozenset(letters), tuple(ranges), tuple(predicates))
+
+
+class RegexDFA:
+    """
+    Deterministic automaton of a regular expression, built lazily from its
+    Thompson NFA by the subset construction. A DFA state is a small integer
+    and its transitions are computed the first time a letter is seen from
+    it, so only the states reached while the lexicon is traversed are ever
+    built.
+
+    A state is universal when every continuation of the letters read so
+    far matches, like the state after 'ab' for 'ab.*'. The words below a
+    node reached in a universal state are enumerated without the DFA.
+
+    """
+
+    def __init__(self, pattern):
+        tree = _Parser(pattern).parse()
+        self._labels = []  # NFA state -> list of (label, target)
+        self._epsilon = []  # NFA state -> list of targets
+        start, self._accept = self._build(tree)
+
+        self._sets = []
+        self._index = {}
+        self._transitions = []
+        self.accepting = []
+        self.literal = []
+        self.universal = []
+        self.start = self._state(self._closure({start}))
+
+    def _new(self):
+        self._labels.append([])
+        self._epsilon.append([])
+        return len(self._labels) - 1
+
+    def _build(self, tree):
+        """Thompson construction. Returns the (start, end) NFA states of `tree`."""
+        kind = tree[0]
+        if kind == "set":
+            start, end = self._new(), self._new()
+            self._labels[start].append((tree[1], end))
+            return start, end
+        if kind == "cat":
+            start = end = self._new()
+            for item in tree[1]:
+                item_start, item_end = self._build(item)
+                self._epsilon[end].append(item_start)
+                end = item_end
+            return start, end
+        if kind == "alt":
+            start, end = self._new(), self._new()
+            for branch in tree[1]:
+                branch_start, branch_end = self._build(branch)
+                self._epsilon[start].append(branch_start)
+                self._epsilon[branch_end].append(end)
+            return start, end
+        _, item, low, high = tree
+        start = end = self._new()
+        for _ in range(low):
+            item_start, item_end = self._build(item)
+            self._epsilon[end].append(item_start)
+            end = item_end
+        if high is None:
+            item_start, item_end = self._build(item)
+            self._epsilon[end].append(item_start)
+            self._epsilon[item_end].append(item_start)
+            self._epsilon[end].append(item_end)
+            return start, item_end
+        optional = []
+        for _ in range(high - low):
+            item_start, item_end = self._build(item)
+            self._epsilon[end].append(item_start)
+            optional.append(end)
+            end = item_end
+        for state in optional:
+            self._epsilon[state].append(end)
+        return start, end
+
+    def _closure(self, states):
+        stack = list(states)
+        closure = set(states)
+        while stack:
+            for target in self._epsilon[stack.pop()]:
+                if target not in closure:
+                    closure.add(target)
+                    stack.append(target)
+        return frozenset(closure)
+
+    def _state(self, states):
+        """Returns the DFA state of a set of NFA states, or None if it is empty."""
+        if not states:
+            return None
+        state = self._index.get(states)
+        if state is None:
+            state = self._index[states] = len(self._sets)
+            self._sets.append(states)
+            self._transitions.append({})
+            self.accepting.append(self._accept in states)
+            self.universal.append(self._accept in states and self._loops(states))
+            letters = set()
+            labels = [label for nfa in states for label, _ in self._labels[nfa]]
+            for negated, label_letters, ranges, predicates in labels:
+                if negated or ranges or predicates:
+                    letters = None
+                    break
+                letters.update(label_letters)
+            # The letters leading out of the state, if there is at most one,
+            # are looked up directly instead of trying every edge
+            if letters is None or len(letters) > 1:
+                self.literal.append(None)
+            else:
+                self.literal.append("".join(letters))
+        return state
+
+    def _loops(self, states):
+        """
+        Description:
+            Returns True if one of the NFA states reads any letter and comes
+            back to itself with the accepting state in the same closure, so
+            that every state reached from `states` is accepting.
+        """
+        for nfa in states:
+            for label, target in self._labels[nfa]:
+                if label is ANY:
+                    closure = self._closure({target})
+                    if nfa in closure and self._accept in closure:
+                        return True
+        return False
+
+    def step(self, state, letter):
+        """
+        Description:
+            Returns the DFA state reached from `state` on `letter`, or None
+            if no word continuing with `letter` can match.
+        """
+        transitions = self._transitions[state]
+        try:
+            return transitions[letter]
+        except KeyError:
+            pass
+        targets = {
+            target
+            for nfa in self._sets[state]
+            for label, target in self._labels[nfa]
+            if _matches(label, letter)
+        }
+        target = transitions[letter] = self._state(self._closure(targets))
+        return target
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_regex(pattern):
+    """
+    Description:
+        Compiles a regular expression into a lazily built `RegexDFA`. The
+        supported subset is literals, escaped special characters, '.',
+        character classes like '[a-z]' and '[^aeiou]', the escapes '\\d',
+        '\\w' and '\\s' and their negations, the quantifiers '?', '*', '+',
+        '{m}', '{m,}' and '{m,n}', alternation with '|' and groups. The
+        pattern always matches a whole word, so '^' and '$' are only
+        accepted at its ends. The last compiled patterns are cached, so a
+        repeated pattern reuses the DFA states built by earlier searches.
+
+    Args:
+        :arg pattern (str) The regular expression.
+
+    Returns:
+        :returns (RegexDFA) The automaton of the expression
+
+    Raises:
+        :raises InvalidRegularExpressionError if the pattern is not valid or
+        uses an unsupported construct.
+    """
+    return RegexDFA(pattern)
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_wildcard(wildcard):
+    """
+    Description:
+        Validates a wildcard pattern and compiles it into a lazily built
+        `RegexDFA`, where '*' matches any number of letters and '?' a single
+        letter. A DFA state stands for every position of the pattern reached
+        by the letters read so far, so a word is read once whatever the
+        number of ways the '*' can match it. The last compiled patterns are
+        cached by the raw expression.
+
+    Args:
+        :arg wildcard (str) The wildcard pattern.
+
+    Returns:
+        :returns (tuple) The validated pattern and its `RegexDFA`
+    """
+    wildcard = validate_expression(wildcard)
+    parts = []
+    for symbol in wildcard:
+        if symbol == "*":
+            parts.append(".*")
+        elif symbol == "?":
+            parts.append(".")
+        elif symbol in SPECIAL:
+            parts.append("\\" + symbol)
+        else:
+            parts.append(symbol)
+    return wildcard, RegexDFA("".join(parts))
@@ -1,11 +1,71 @@
+import bz2
+import codecs
+import gc
+import glob
+import gzip
+import heapq
+import locale
+import lzma
+import os
+import pickle
 import re
-from contextlib import closing
+import tempfile
+from contextlib import closing, contextmanager
+from itertools import groupby, islice
+from operator import itemgetter
 
-__all__ = ["validate_expression", "gen_source"]
+__all__ = [
+    "validate_expression",
+    "gen_source",
+    "open_source",
+    "source_files",
+    "external_sort",
+    "gc_paused",
+]
 
 PATTERN_FOR_WILDCARD_SEARCH = re.compile(r"(?:(\*\?)+|(\?\*)+|\*+)")
 PATTERN_FOR_CONSECUTIVE_QUESTION_MARK = re.compile(r"\?+")
 
+# Characters or bytes read from a source file at a time
+BLOCK_SIZE = 1 << 20
+
+# Magic numbers and file extensions of the supported compression formats
+COMPRESSION_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".lzma": "xz",
+    ".zst": "zstd",
+}
+
+# Pairs pickled together in a run file and runs merged at once
+RUN_BATCH_SIZE = 10000
+MAX_MERGE_RUNS = 64
+
+
+@contextmanager
+def gc_paused():
+    """
+    Description:
+        Disables the cyclic garbage collector inside the block. Nodes do not
+        form reference cycles, but every collection triggered while millions
+        of them are created scans the whole growing graph, which roughly
+        doubles the time of a bulk insertion.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
 
 def validate_expression(wildcard_expression):
     """
@@ -39,13 +99,237 @@ def validate_expression(wildcard_expression):
     return result
 
 
-def gen_source(source):
-    """ """
+def _iter_lines(input_file, encoding=None):
+    """
+    Description:
+        Yields the lines of a text or binary file without line endings. The
+        file is read in blocks of `BLOCK_SIZE`, every block is decoded once
+        and split into lines in bulk.
+    """
+    decoder = None
+    pending = ""
+    while True:
+        block = input_file.read(BLOCK_SIZE)
+        if not block:
+            break
+        if isinstance(block, bytes):
+            if decoder is None:
+                encoding = encoding or locale.getpreferredencoding(False)
+                decoder = codecs.getincrementaldecoder(encoding)()
+            block = decoder.decode(block)
+        lines = (pending + block).split("\n")
+        pending = lines.pop()
+        yield from lines
+    if decoder is not None:
+        pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _parse_count(line):
+    word, tab, count = line.rpartition("\t")
+    if not tab:
+        return line, 1
+    try:
+        return word.strip(), int(count)
+    except ValueError:
+        raise ValueError(f"Invalid count in line '{line}'") from None
+
+
+def _open_zstd(path):
+    try:
+        from compression import zstd
+    except ImportError:
+        pass
+    else:
+        return zstd.open(path, "rb")
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            f"Reading '{path}' requires the `zstandard` package. "
+            f"Install it with `pip install lexpy[zstd]`"
+        ) from None
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+def open_source(path):
+    """
+    Description:
+        Opens a file in binary mode. Files compressed with gzip, bz2, xz or
+        zstd are detected by their magic number or, failing that, their
+        extension, and decompressed while they are read. Reading zstd files
+        requires Python 3.14 or the optional `zstandard` package.
+
+    Args:
+        :arg path (str) Path of the file
+
+    Returns:
+        :returns (File) A binary file object
+    """
+    with open(path, "rb") as infile:
+        head = infile.read(8)
+    compression = None
+    for magic, name in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            compression = name
+            break
+    else:
+        compression = COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "bz2":
+        return bz2.open(path, "rb")
+    if compression == "xz":
+        return lzma.open(path, "rb")
+    if compression == "zstd":
+        return _open_zstd(path)
+    return open(path, "rb")
+
+
+def source_files(source):
+    """
+    Description:
+        Yields a file object for every file of `source`, in order. A path
+        which does not exist is expanded as a glob pattern and the matching
+        files are read in sorted order.
+
+    Args:
+        :arg source (str, File, list, tuple) A path, a glob pattern, a file
+        object or a list or tuple of them.
+
+    Raises:
+        :raises IOError if a path does not exist and matches no file.
+    """
     if hasattr(source, "read"):
-        input_file = source
+        yield source
+    elif isinstance(source, (list, tuple)):
+        for item in source:
+            yield from source_files(item)
     else:
-        input_file = open(source, "r")
+        path = os.fspath(source)
+        if os.path.exists(path):
+            paths = [path]
+        else:
+            paths = sorted(glob.glob(path))
+            if not paths:
+                raise IOError("File does not exists")
+        for path in paths:
+            yield open_source(path)
+
+
+def gen_source(source, with_count=False):
+    """
+    Description:
+        Yields the words of one or more files, one per line, with
+        surrounding whitespace removed.
+
+    Args:
+        :arg source (str, File, list, tuple) Path of a file, possibly
+        compressed, a glob pattern, a text or binary file object, or a list
+        or tuple of them. Files given by path are decoded with the preferred
+        encoding of the locale, like `open(path)`.
+
+        :arg with_count (bool) Every line is `word<TAB>count`. A line without
+        a tab has a count of 1.
+
+    Returns:
+        :returns (Generator) The words, or (word, count) pairs with
+        `with_count`.
+
+    Raises:
+        :raises ValueError if a count is not an integer.
+    """
+    for input_file in source_files(source):
+        with closing(input_file):
+            lines = map(str.strip, _iter_lines(input_file))
+            if with_count:
+                yield from map(_parse_count, lines)
+            else:
+                yield from lines
+
+
+def _write_run(pairs, directory):
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(fd, "wb") as out:
+        pairs = iter(pairs)
+        while True:
+            batch = list(islice(pairs, RUN_BATCH_SIZE))
+            if not batch:
+                break
+            pickle.dump(batch, out, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path):
+    with open(path, "rb") as infile:
+        while True:
+            try:
+                batch = pickle.load(infile)
+            except EOFError:
+                break
+            yield from batch
+
+
+def _sum_counts(pairs):
+    for word, group in groupby(pairs, key=itemgetter(0)):
+        yield word, sum(count for _, count in group)
+
+
+def _merge_runs(paths):
+    return _sum_counts(heapq.merge(*map(_read_run, paths), key=itemgetter(0)))
+
+
+def external_sort(source, chunk_size=1000000, tmpdir=None):
+    """
+    Description:
+        Sorts a stream of words which may not fit in memory and counts
+        them. Up to `chunk_size` distinct words are counted in memory, then
+        written to a sorted run file in a temporary directory. The runs are
+        merged `MAX_MERGE_RUNS` at a time until one sorted stream is left.
+        The temporary files are removed once the generator is exhausted or
+        closed.
+
+    Args:
+        :arg source (iterable) The words, or (word, count) pairs.
+        :arg chunk_size (int) The number of distinct words held in memory.
+        :arg tmpdir (str) Directory of the run files. Default is the system
+        temporary directory.
+
+    Returns:
+        :returns (Generator) (word, count) pairs in alphabetical order, every
+        word once with the sum of its counts.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size should be a positive number")
+    with tempfile.TemporaryDirectory(dir=tmpdir, prefix="lexpy-") as directory:
+        runs = []
+        counts = {}
+        for item in source:
+            if isinstance(item, str):
+                word, count = item, 1
+            else:
+                word, count = item
+            if not word:
+                continue
+            counts[word] = counts.get(word, 0) + count
+            if len(counts) >= chunk_size:
+                runs.append(_write_run(sorted(counts.items()), directory))
+                counts = {}
+
+        if not runs:
+            yield from sorted(counts.items())
+            return
+        if counts:
+            runs.append(_write_run(sorted(counts.items()), directory))
 
-    with closing(input_file):
-        for line in input_file:
-            yield line.strip()
+        while len(runs) > MAX_MERGE_RUNS:
+            merged = []
+            for i in range(0, len(runs), MAX_MERGE_RUNS):
+                group = runs[i : i + MAX_MERGE_RUNS]
+                merged.append(_write_run(_merge_runs(group), directory))
+                for path in group:
+                    os.remove(path)
+            runs = merged
+        yield from _merge_runs(runs)
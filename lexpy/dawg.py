@@ -1,90 +1,469 @@
-from lexpy._base.node import FSANode
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from lexpy._base.node import CompactDAWGNode, DAWGNode
 from lexpy._base.automata import FSA
+from lexpy._utils import external_sort, gc_paused, gen_source
 
 __all__ = ["DAWG"]
 
 
+def _build_shard(words):
+    """
+    Description:
+        Builds and minimizes the DAWG of a sorted shard of words in a
+        worker process of `DAWG.build_parallel`.
+
+    Returns:
+        :returns (tuple) The nodes below the root in postorder, the edges of
+        the root, the count of the root and the number of words. A node is
+        a (letter, eow, count, edges) tuple and an edge is a (letter, index
+        of the target node) pair.
+    """
+    dawg = DAWG()
+    for word in words:
+        dawg.add(word)
+    dawg.reduce()
+
+    index = {}
+    nodes = []
+    stack = [(dawg.root, iter(dawg.root.children.values()))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if id(child) not in index:
+                stack.append((child, iter(child.children.values())))
+                break
+        else:
+            stack.pop()
+            edges = tuple(
+                (letter, index[id(child)])
+                for letter, child in sorted(node.children.items())
+            )
+            if node is dawg.root:
+                return nodes, edges, node.count, dawg.get_word_count()
+            index[id(node)] = len(nodes)
+            nodes.append((node.val, node.eow, node.count, edges))
+
+
 class DAWG(FSA):
 
     __slots__ = (
         "root",
+        "__incremental",
         "__prev_word",
         "__prev_node",
         "__minimized_nodes",
         "__unchecked_nodes",
     )
 
-    def __init__(self):
-        root = FSANode(1, "")
+    def __init__(self, incremental=False, compact=False):
+        """
+        Description:
+            Initialize an empty DAWG.
+
+        Args:
+            :arg incremental (bool) Accept words in any order. Words added
+            in alphabetical order are inserted and minimized in bulk. An
+            out of order word is inserted into the minimized graph, which
+            is updated along the path of the word only. Without it, an out
+            of order word raises ValueError. Default is False.
+
+            :arg compact (bool) Store the children of every node in arrays
+            instead of a dict. This uses less memory and makes lookups
+            slower. Default is False.
+        """
+        root = (CompactDAWGNode if compact else DAWGNode)(1, "")
         super(DAWG, self).__init__(root=root)
+        self.__incremental = incremental
         self.__prev_word = ""
         self.__prev_node = root
         self.__minimized_nodes = {}
         self.__unchecked_nodes = []
 
+    def _node_id(self, node):
+        return node.id
+
     def add(self, word, count=1):
-        if word < self.__prev_word:
-            raise ValueError(
-                f"Words should be inserted in alphabetical order\n"
-                f"Previous word was '{self.__prev_word}' "
-                f"and current word is '{word}'"
-            )
-        elif word == self.__prev_word:
-            self.__prev_node.count += count
-        else:
-            # find common prefix between word and previous word
-            common_prefix_index = 0
-            for i, letters in enumerate(zip(word, self.__prev_word), start=1):
-                if letters[0] != letters[1]:
-                    break
-                common_prefix_index = i
+        """
+        Description:
+            Adds `count` to the count of `word` and inserts the word if it
+            is not in the DAWG. A negative count is subtracted from the count
+            of the word, which is removed when its count drops to zero.
 
-            self._reduce(common_prefix_index)
+        Args:
+            :arg word (str) The word to insert.
+            :arg count (int) Count of the word. Default value is 1.
 
-            if len(self.__unchecked_nodes) == 0:
-                node = self.root
+        Raises:
+            :raises ValueError if the word is out of alphabetical order and
+            the DAWG is not incremental.
+        """
+        if count < 0:
+            self._discount(word, -count)
+            return
+        self._version += 1
+        prev_word = self.__prev_word
+        if word < prev_word:
+            if not self.__incremental:
+                raise ValueError(
+                    f"Words should be inserted in alphabetical order\n"
+                    f"Previous word was '{prev_word}' "
+                    f"and current word is '{word}'"
+                )
+            self._reduce(0)
+            self._update(word, count)
+        elif word == prev_word:
+            if self.__unchecked_nodes or not word:
+                self.__prev_node.count += count
             else:
-                node = self.__unchecked_nodes[-1][2]
+                self._update(word, count)
+        else:
+            self._add_sorted(word, count)
+        self._num_of_words += count
 
-            for letter in word[common_prefix_index:]:
-                _id = self._id + 1
-                node.add_child(letter, _id)
-                self.__unchecked_nodes.append((node, letter, node.children[letter]))
-                node = node.children[letter]
-                self._id = _id
+    def _add_sorted(self, word, count):
+        prev_word = self.__prev_word
+        unchecked = self.__unchecked_nodes
+        if not unchecked and self.root.children:
+            # The graph was reduced, unfreeze the path of the previous word
+            path = self._detach(prev_word)
+            for i in range(1, len(path)):
+                unchecked.append((path[i - 1], prev_word[i - 1], path[i]))
 
-            node.eow = True
-            node.count += count
-            self.__prev_node = node
+        # find common prefix between word and previous word
+        common_prefix_index = 0
+        for i, letters in enumerate(zip(word, prev_word[: len(unchecked)]), start=1):
+            if letters[0] != letters[1]:
+                break
+            common_prefix_index = i
 
-        self._num_of_words += count
+        self._reduce(common_prefix_index)
+
+        if len(unchecked) == 0:
+            node = self.root
+        else:
+            node = unchecked[-1][2]
+
+        for letter in word[common_prefix_index:]:
+            _id = self._id + 1
+            node.add_child(letter, _id)
+            unchecked.append((node, letter, node.children[letter]))
+            node = node.children[letter]
+            self._id = _id
+
+        if self._suffix_index is not None:
+            self._suffix_index.add(word)
+        node.eow = True
+        node.count += count
+        self.__prev_node = node
         self.__prev_word = word
 
+    def _update(self, word, count):
+        """
+        Description:
+            Adds `count` to the count of `word` in the minimized graph and
+            inserts the word if needed. Only the nodes on the path of the
+            word are copied, changed and minimized again.
+        """
+        if not word:
+            self.root.count += count
+            return
+        path = self._detach(word)
+        node = path[-1]
+        for letter in word[len(path) - 1 :]:
+            self._id += 1
+            node.add_child(letter, self._id)
+            node = node.children[letter]
+            path.append(node)
+        if not node.eow and self._suffix_index is not None:
+            self._suffix_index.add(word)
+        node.eow = True
+        node.count += count
+        self._minimize_path(word, path)
+
+    def _discount(self, word, count=None):
+        """
+        Description:
+            Subtracts `count` from the count of `word`, or removes the word
+            if `count` is None or at least its count. The path of the word
+            is minimized again and nodes which no longer lead to a word are
+            deleted.
+
+        Returns:
+            :returns (bool) True if the word was in the DAWG
+        """
+        if not isinstance(word, str) or not word or word not in self:
+            return False
+        self._version += 1
+        self._reduce(0)
+        path = self._detach(word)
+        node = path[-1]
+        if count is None or count >= node.count:
+            count = node.count
+            node.eow = False
+            if self._suffix_index is not None:
+                self._suffix_index.remove(word)
+        node.count -= count
+        self._num_of_words -= count
+        self._minimize_path(word, path)
+        return True
+
+    def _detach(self, word):
+        """
+        Description:
+            Makes the nodes on the path of `word` private so that they can
+            be changed: shared nodes are copied and the other nodes are
+            removed from the register.
+
+        Returns:
+            :returns (list) The nodes from the root along the longest prefix
+            of `word` in the graph.
+        """
+        register = self.__minimized_nodes
+        node = self.root
+        path = [node]
+        for letter in word:
+            child = node.children.get(letter)
+            if child is None:
+                break
+            if child.refs > 1:
+                self._id += 1
+                clone = type(child)(self._id, letter)
+                clone.eow = child.eow
+                clone.count = child.count
+                clone.max_count = child.max_count
+                clone.num_of_words = child.num_of_words
+                clone.children = dict(child.children)
+                for grandchild in clone.children.values():
+                    grandchild.refs += 1
+                clone.refs = 1
+                child.refs -= 1
+                node.children[letter] = clone
+                child = clone
+            else:
+                key = child.signature()
+                if register.get(key) is child:
+                    del register[key]
+            path.append(child)
+            node = child
+        return path
+
+    def _minimize_path(self, word, path):
+        """
+        Description:
+            Registers the detached nodes of `path` from the deepest one up,
+            replacing a node by an equivalent registered node and deleting
+            nodes which no longer lead to a word.
+        """
+        register = self.__minimized_nodes
+        for i in reversed(range(1, len(path))):
+            node = path[i]
+            parent = path[i - 1]
+            letter = word[i - 1]
+            if not node.eow and not node.children:
+                del parent.children[letter]
+                self._release(node)
+                continue
+            node.update_max_count()
+            key = node.signature()
+            other = register.get(key)
+            if other is None:
+                register[key] = node
+            elif other is not node:
+                parent.children[letter] = other
+                other.refs += 1
+                self._release(node)
+        self.root.update_max_count()
+
+    def _release(self, node):
+        """
+        Description:
+            Removes an edge pointing to `node`. A node left without incoming
+            edges is removed from the register and releases its children.
+        """
+        register = self.__minimized_nodes
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            node.refs -= 1
+            if node.refs == 0:
+                key = node.signature()
+                if register.get(key) is node:
+                    del register[key]
+                stack.extend(node.children.values())
+
     def reduce(self):
+        self._version += 1
         self._reduce(0)
+        self.root.update_max_count()
 
     def _reduce(self, to):
-        for i in reversed(range(to, len(self.__unchecked_nodes))):
-            parent, letter, child = self.__unchecked_nodes[i]
-            # If there are children
-            if child.children and child in self.__minimized_nodes:
-                parent.children[letter] = self.__minimized_nodes[child]
-            else:
-                self.__minimized_nodes[child] = child
+        register = self.__minimized_nodes
+        unchecked = self.__unchecked_nodes
+        for i in reversed(range(to, len(unchecked))):
+            parent, letter, child = unchecked[i]
+            child.update_max_count()
+            key = child.signature()
+            other = register.get(key)
+            if other is None:
+                register[key] = child
+            elif other is not child:
+                parent.children[letter] = other
+                other.refs += 1
+                self._release(child)
+        del unchecked[to:]
+
+    @classmethod
+    def build_parallel(
+        cls, source, workers=None, shard_size=100000, mp_context=None, compact=False
+    ):
+        """
+        Description:
+            Builds a DAWG from a sorted source of words in a pool of worker
+            processes. The words are split in shards of consecutive words
+            starting with different letters. Every worker builds and reduces
+            the DAWG of a shard, and the shards are merged under a common
+            root while the source is still being read. The merge registers
+            the nodes of all the shards, so suffixes shared across shards
+            are minimized as well.
+
+        Args:
+            :arg source (list, set, tuple, Generator, File) The words, sorted
+            unless `source` is a list, a set or a tuple.
+
+            :arg workers (int) The number of worker processes. Default is
+            the number of CPUs.
+
+            :arg shard_size (int) A shard is sent to a worker once it holds
+            at least `shard_size` words and the next word starts with
+            another letter.
 
-            self.__unchecked_nodes.pop()
+            :arg mp_context (multiprocessing.context.BaseContext) The
+            multiprocessing context of the pool.
 
-    def add_all(self, source):
+            :arg compact (bool) Build the DAWG with compact nodes.
+
+        Returns:
+            :returns (DAWG) The reduced DAWG
+
+        Raises:
+            :raises ValueError if the words are not sorted.
+
+        Example:
+            >>> from lexpy import DAWG
+            >>> dawg = DAWG.build_parallel(['tap', 'taps', 'top', 'tops'])
+            >>> dawg.search('t*')
+            ['tap', 'taps', 'top', 'tops']
+        """
+        if isinstance(source, (list, set, tuple)):
+            source = sorted(source)
+        elif isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+            source = gen_source(source)
+
+        dawg = cls(compact=compact)
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            pending = deque()
+            shard = []
+            prev = ""
+            for word in source:
+                if word < prev:
+                    raise ValueError(
+                        f"Words should be inserted in alphabetical order\n"
+                        f"Previous word was '{prev}' "
+                        f"and current word is '{word}'"
+                    )
+                if len(shard) >= shard_size and word[:1] != prev[:1]:
+                    pending.append(pool.submit(_build_shard, shard))
+                    shard = []
+                    if len(pending) > 2 * workers:
+                        dawg._merge_shard(pending.popleft().result())
+                shard.append(word)
+                prev = word
+            if shard:
+                pending.append(pool.submit(_build_shard, shard))
+            while pending:
+                dawg._merge_shard(pending.popleft().result())
+
+        dawg.root.update_max_count()
+        dawg.__prev_word = prev
+        return dawg
+
+    def _merge_shard(self, shard):
+        """
+        Description:
+            Copies the nodes of a shard built by `_build_shard` below the
+            root. A node equal to an already registered node of any shard
+            is replaced by it, following the same rules as `_reduce`.
+
+        Args:
+            :arg shard (tuple) The nodes returned by `_build_shard`.
+        """
+        records, root_edges, root_count, num_of_words = shard
+        register = self.__minimized_nodes
+        nodes = []
+        for val, eow, count, edges in records:
+            # Same layout as DAWGNode.signature
+            key = [eow, count]
+            for letter, i in edges:
+                key.append(letter)
+                key.append(nodes[i].id)
+            key = tuple(key)
+            node = register.get(key)
+            if node is None:
+                self._id += 1
+                node = type(self.root)(self._id, val)
+                node.eow = eow
+                node.count = count
+                node.children = {letter: nodes[i] for letter, i in edges}
+                for child in node.children.values():
+                    child.refs += 1
+                node.update_max_count()
+                register[key] = node
+            nodes.append(node)
+
+        for letter, i in root_edges:
+            self.root.children[letter] = nodes[i]
+            nodes[i].refs += 1
+        self.root.count += root_count
+        self._num_of_words += num_of_words
+
+    def add_all(
+        self, source, with_count=False, sort=False, chunk_size=1000000, tmpdir=None
+    ):
         """Add all words from a Sequence datatype or File like object
 
+        Description:
+            Lists, sets and tuples are sorted in memory. Files and generators
+            should be sorted unless `sort` is True. With `sort`, the words are
+            sorted with an external merge sort which holds at most
+            `chunk_size` distinct words in memory and spills sorted runs to
+            temporary files. Repeated words are inserted once with the sum of
+            their counts.
+
         Args:
             source: Sequence datatype (list, set, tuple) or a file like object
+            with_count (bool): Every line of a file is `word<TAB>count` and
+                every item of any other source is a (word, count) pair.
+            sort (bool): Sort the source in bounded memory. Default is False.
+            chunk_size (int): The number of distinct words held in memory by
+                the external sort.
+            tmpdir (str): Directory of the temporary files of the external
+                sort. Default is the system temporary directory.
 
         """
+        if sort:
+            if isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+                source = gen_source(source, with_count=with_count)
+            with gc_paused():
+                self._add_words(external_sort(source, chunk_size, tmpdir))
+            return
         if isinstance(source, (list, set, tuple)):
             source = sorted(source)
-        super(DAWG, self).add_all(source=source)
+        super(DAWG, self).add_all(source=source, with_count=with_count)
 
     def __len__(self):
         """Returns the number of nodes in DAWG instance"""
-        return len(self.__minimized_nodes)
+        return len(self.__minimized_nodes) + len(self.__unchecked_nodes)
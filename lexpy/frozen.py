@@ -0,0 +1,500 @@
+import mmap as _mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from lexpy._base.automata import FSA
+
+__all__ = ["FrozenFSA", "load"]
+
+MAGIC = b"LEXPYFSA"
+VERSION = 1
+
+# magic, version, number of sections, number of words
+HEADER = struct.Struct("<8sIIQ")
+# name, typecode, offset, number of items
+SECTION = struct.Struct("<8sc7xQQ")
+ALIGNMENT = 8
+# `check` of a double array slot which holds no transition
+EMPTY = 0xFFFFFFFF
+
+
+def _double_array(first, labels, targets):
+    """
+    Description:
+        Compiles the edge tables into a double array. The letters of the
+        automaton are numbered from 1 in code point order. The edge of node
+        `i` labelled with the letter numbered `c` is stored in slot
+        `base[i] + c`, where `check` holds `i` and `next` the target node.
+        Every node is placed at the lowest `base` where the slots of all its
+        letters are free.
+
+    Returns:
+        :returns (tuple) (codes, base, check, next), where `codes` maps a
+        code point to the number of its letter, or 0 if it is not in the
+        automaton.
+    """
+    alphabet = sorted(set(labels))
+    codes = array("I", bytes(4 * (alphabet[-1] + 1 if alphabet else 1)))
+    for i, point in enumerate(alphabet, start=1):
+        codes[point] = i
+
+    num_of_nodes = len(first) - 1
+    base = array("I", bytes(4 * num_of_nodes))
+    size = len(labels) + len(alphabet) + 1
+    used = bytearray(size)
+    check = array("I", [EMPTY]) * size
+    next_ = array("I", bytes(4 * size))
+    free = 1
+    for node in range(num_of_nodes):
+        lo = first[node]
+        hi = first[node + 1]
+        if lo == hi:
+            continue
+        letters = [codes[point] for point in labels[lo:hi]]
+        head = letters[0]
+        pos = used.find(0, max(free, head))
+        while True:
+            if pos < 0 or pos + len(alphabet) >= len(used):
+                grow = len(used) + len(alphabet) + 1
+                used.extend(bytes(grow))
+                check.extend(array("I", [EMPTY]) * grow)
+                next_.frombytes(bytes(4 * grow))
+                if pos < 0:
+                    pos = used.find(0, max(free, head))
+            b = pos - head
+            if hi - lo == 1 or all(not used[b + c] for c in letters):
+                break
+            pos = used.find(0, pos + 1)
+        base[node] = b
+        for c, target in zip(letters, targets[lo:hi]):
+            used[b + c] = 1
+            check[b + c] = node
+            next_[b + c] = target
+        free = used.find(0, free)
+        if free < 0:
+            free = len(used)
+
+    size = max(base, default=0) + len(alphabet) + 1
+    del check[size:]
+    del next_[size:]
+    return codes, base, check, next_
+
+
+class FrozenFSA(FSA):
+    """
+    Read-only Finite State Automaton compiled from a `Trie` or a `DAWG`.
+
+    Nodes are plain integers and the root is node 0. The outgoing edges of
+    node `i` are stored at positions `first[i]` to `first[i + 1]` of the
+    parallel `labels` (code points, sorted) and `targets` tables. End of
+    word flags are kept in a bitset and counts in an array, both indexed
+    by node.
+
+    Compiled with `double_array=True`, the edges are also stored in a
+    double array indexed by small letter numbers, so following an edge is
+    index arithmetic instead of a binary search.
+
+    """
+
+    __slots__ = (
+        "_first",
+        "_labels",
+        "_targets",
+        "_eow_bits",
+        "_counts",
+        "_max_counts",
+        "_words",
+        "_codes",
+        "_base",
+        "_check",
+        "_next",
+        "_buffer",
+    )
+
+    # (section name, attribute, array typecode) of the on-disk format
+    _SECTIONS = (
+        (b"first", "_first", "I"),
+        (b"labels", "_labels", "I"),
+        (b"targets", "_targets", "I"),
+        (b"counts", "_counts", "Q"),
+        (b"maxcount", "_max_counts", "Q"),
+        (b"eow", "_eow_bits", "B"),
+        (b"words", "_words", "I"),
+        (b"alphabet", "_codes", "I"),
+        (b"base", "_base", "I"),
+        (b"check", "_check", "I"),
+        (b"next", "_next", "I"),
+    )
+
+    def __init__(
+        self,
+        first,
+        labels,
+        targets,
+        eow_bits,
+        counts,
+        max_counts,
+        num_of_words,
+        words,
+    ):
+        """
+        Description:
+            Initialize a FrozenFSA from its tables. Use `Trie.freeze()` or
+            `DAWG.freeze()` instead of calling this directly.
+
+        Args:
+            :arg first (array) Offset of the first edge of every node,
+            followed by the total number of edges.
+            :arg labels (array) Code point of every edge label.
+            :arg targets (array) Target node of every edge.
+            :arg eow_bits (bytes) End of word bitset.
+            :arg counts (array) Word count of every node.
+            :arg max_counts (array) Highest word count below every node.
+            :arg num_of_words (int) Number of words in the automaton.
+            :arg words (array) Number of distinct words ending at or below
+            every node.
+        """
+        super(FrozenFSA, self).__init__(root=0)
+        self._first = first
+        self._labels = labels
+        self._targets = targets
+        self._eow_bits = eow_bits
+        self._counts = counts
+        self._max_counts = max_counts
+        self._words = words
+        self._id = len(counts)
+        self._num_of_words = num_of_words + 1
+        self._codes = None
+        self._base = None
+        self._check = None
+        self._next = None
+        self._buffer = None
+
+    @classmethod
+    def from_fsa(cls, fsa, double_array=False):
+        """
+        Description:
+            Compiles `fsa` into flat tables. Nodes are numbered in depth
+            first order and edges are sorted by label. Nodes shared in a
+            DAWG are compiled once.
+
+        Args:
+            :arg fsa (lexpy._base.automata.FSA) The automaton to compile.
+
+            :arg double_array (bool) Also compile the edges into a double
+            array for faster lookups.
+
+        Returns:
+            :returns (FrozenFSA) The compiled automaton
+        """
+        # Shared nodes are recognised by their id in the automaton, the
+        # nodes of a tree by their identity
+        key = id if fsa._node_id(fsa.root) is None else fsa._node_id
+        index = {}
+        nodes = []
+        edges = []
+        stack = [fsa.root]
+        while stack:
+            node = stack.pop()
+            if key(node) in index:
+                continue
+            index[key(node)] = len(nodes)
+            nodes.append(node)
+            out = sorted(fsa._children(node), key=lambda edge: edge[0])
+            edges.append(out)
+            for _, child in reversed(out):
+                if key(child) not in index:
+                    stack.append(child)
+
+        first = array("I", [0])
+        labels = array("I")
+        targets = array("I")
+        counts = array("Q")
+        max_counts = array("Q")
+        words = array("I")
+        eow_bits = bytearray((len(nodes) + 7) // 8)
+        for i, node in enumerate(nodes):
+            for letter, child in edges[i]:
+                labels.append(ord(letter))
+                targets.append(index[key(child)])
+            first.append(len(labels))
+            if fsa._eow(node):
+                eow_bits[i >> 3] |= 1 << (i & 7)
+            counts.append(fsa._count(node))
+            max_counts.append(fsa._max_count(node))
+            words.append(fsa._words_below(node))
+
+        frozen = cls(
+            first,
+            labels,
+            targets,
+            bytes(eow_bits),
+            counts,
+            max_counts,
+            fsa.get_word_count(),
+            words,
+        )
+        if double_array:
+            tables = _double_array(first, labels, targets)
+            frozen._codes, frozen._base, frozen._check, frozen._next = tables
+        return frozen
+
+    def _child(self, node, letter):
+        if self._base is not None:
+            code = ord(letter)
+            if code >= len(self._codes):
+                return None
+            slot = self._base[node] + self._codes[code]
+            return self._next[slot] if self._check[slot] == node else None
+        hi = self._first[node + 1]
+        code = ord(letter)
+        i = bisect_left(self._labels, code, self._first[node], hi)
+        if i < hi and self._labels[i] == code:
+            return self._targets[i]
+        return None
+
+    def _children(self, node):
+        lo = self._first[node]
+        hi = self._first[node + 1]
+        return zip(map(chr, self._labels[lo:hi]), self._targets[lo:hi])
+
+    def _eow(self, node):
+        return (self._eow_bits[node >> 3] >> (node & 7)) & 1 == 1
+
+    def _count(self, node):
+        return self._counts[node]
+
+    def _max_count(self, node):
+        return self._max_counts[node]
+
+    def _words_below(self, node):
+        return self._words[node]
+
+    def _node_id(self, node):
+        return node
+
+    def __contains__(self, word):
+        if word == "":
+            return True
+        if word is None:
+            return False
+        if self._base is not None:
+            codes = self._codes
+            base = self._base
+            check = self._check
+            next_ = self._next
+            size = len(codes)
+            node = 0
+            for letter in word:
+                code = ord(letter)
+                if code >= size:
+                    return False
+                slot = base[node] + codes[code]
+                if check[slot] != node:
+                    return False
+                node = next_[slot]
+            return self._eow(node)
+        first = self._first
+        labels = self._labels
+        node = 0
+        for letter in word:
+            hi = first[node + 1]
+            code = ord(letter)
+            i = bisect_left(labels, code, first[node], hi)
+            if i == hi or labels[i] != code:
+                return False
+            node = self._targets[i]
+        return self._eow(node)
+
+    def __len__(self):
+        """Returns the number of nodes in the frozen automaton"""
+        return len(self._counts)
+
+    def add(self, word, count=1):
+        raise TypeError("FrozenFSA is read-only")
+
+    def add_all(self, source):
+        raise TypeError("FrozenFSA is read-only")
+
+    def remove(self, word):
+        raise TypeError("FrozenFSA is read-only")
+
+    def freeze(self, double_array=False):
+        """
+        Description:
+            Returns this automaton. With `double_array` and no double array
+            tables yet, returns a copy sharing the tables of this automaton
+            with a double array compiled from its edges. A copy of an
+            automaton opened with `lexpy.load` is valid until it is closed.
+        """
+        if not double_array or self._base is not None:
+            return self
+        frozen = FrozenFSA(
+            self._first,
+            self._labels,
+            self._targets,
+            self._eow_bits,
+            self._counts,
+            self._max_counts,
+            self.get_word_count(),
+            self._words,
+        )
+        tables = _double_array(self._first, self._labels, self._targets)
+        frozen._codes, frozen._base, frozen._check, frozen._next = tables
+        return frozen
+
+    def save(self, path):
+        """
+        Description:
+            Writes the tables to `path` in the lexpy binary format. The
+            file starts with a header and a section directory, followed by
+            every table stored little-endian and 8 byte aligned, so it can
+            be memory mapped by `lexpy.load`.
+
+        Args:
+            :arg path (str) Path of the output file
+        """
+        sections = []
+        for name, attr, typecode in self._SECTIONS:
+            table = getattr(self, attr)
+            if table is None:
+                continue
+            if sys.byteorder != "little" and typecode != "B":
+                table = array(typecode, table)
+                table.byteswap()
+            sections.append((name, typecode, memoryview(table).tobytes(), len(table)))
+
+        offset = HEADER.size + SECTION.size * len(sections)
+        directory = []
+        for name, typecode, data, length in sections:
+            offset += -offset % ALIGNMENT
+            directory.append(SECTION.pack(name, typecode.encode(), offset, length))
+            offset += len(data)
+
+        with open(path, "wb") as out:
+            out.write(HEADER.pack(MAGIC, VERSION, len(sections), self.get_word_count()))
+            out.write(b"".join(directory))
+            position = HEADER.size + SECTION.size * len(sections)
+            for _, _, data, _ in sections:
+                padding = -position % ALIGNMENT
+                out.write(b"\0" * padding)
+                out.write(data)
+                position += padding + len(data)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Description:
+            Opens a file written by `save`. With `mmap=True` the tables are
+            views into a read-only memory map of the file: opening is O(1)
+            and processes that load the same file share its pages. With
+            `mmap=False` the tables are copied into memory.
+
+        Args:
+            :arg path (str) Path of the lexpy file
+            :arg mmap (bool) Memory map the file instead of reading it
+
+        Returns:
+            :returns (FrozenFSA) The loaded automaton
+
+        Raises:
+            :raises ValueError if the file is not a lexpy file
+        """
+        with open(path, "rb") as infile:
+            if mmap and sys.byteorder == "little":
+                buffer = _mmap.mmap(infile.fileno(), 0, access=_mmap.ACCESS_READ)
+            else:
+                buffer = infile.read()
+
+        mapped = isinstance(buffer, _mmap.mmap)
+        data = memoryview(buffer)
+        error = None
+        if len(data) < HEADER.size or data[: len(MAGIC)] != MAGIC:
+            error = f"'{path}' is not a lexpy file"
+        else:
+            _, version, num_of_sections, num_of_words = HEADER.unpack_from(data)
+            if version > VERSION:
+                error = f"Unsupported lexpy file version {version}"
+        if error is not None:
+            data.release()
+            if mapped:
+                buffer.close()
+            raise ValueError(error)
+
+        tables = {}
+        for i in range(num_of_sections):
+            name, typecode, offset, length = SECTION.unpack_from(
+                data, HEADER.size + i * SECTION.size
+            )
+            typecode = typecode.decode()
+            size = length * array(typecode).itemsize
+            view = data[offset : offset + size]
+            if mapped:
+                tables[name.rstrip(b"\0")] = view.cast(typecode)
+            else:
+                table = array(typecode)
+                table.frombytes(view)
+                if sys.byteorder != "little":
+                    table.byteswap()
+                tables[name.rstrip(b"\0")] = table
+
+        fsa = cls.__new__(cls)
+        FSA.__init__(fsa, root=0)
+        for name, attr, _ in cls._SECTIONS:
+            setattr(fsa, attr, tables.get(name))
+        fsa._id = len(fsa._counts)
+        fsa._num_of_words = num_of_words + 1
+        fsa._buffer = buffer if mapped else None
+        return fsa
+
+    def close(self):
+        """
+        Description:
+            Releases the memory map of a FrozenFSA opened with
+            `lexpy.load(path, mmap=True)`. The automaton cannot be queried
+            afterwards.
+        """
+        if self._buffer is None:
+            return
+        for _, attr, _ in self._SECTIONS:
+            table = getattr(self, attr)
+            if isinstance(table, memoryview):
+                table.release()
+            setattr(self, attr, None)
+        self._buffer.close()
+        self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def load(path, mmap=True):
+    """
+    Description:
+        Loads a lexicon written by `Trie.save`, `DAWG.save` or
+        `FrozenFSA.save`.
+
+    Args:
+        :arg path (str) Path of the lexpy file
+        :arg mmap (bool) Memory map the file instead of reading it.
+        Default is True.
+
+    Returns:
+        :returns (FrozenFSA) The loaded, read-only automaton
+
+    Example:
+        >>> from lexpy import DAWG, load
+        >>> dawg = DAWG()
+        >>> dawg.add_all(['tap', 'taps', 'top', 'tops'])
+        >>> dawg.reduce()
+        >>> dawg.save('/tmp/words.lexpy')
+        >>> frozen = load('/tmp/words.lexpy')
+        >>> 'taps' in frozen
+        True
+    """
+    return FrozenFSA.load(path, mmap=mmap)
@@ -0,0 +1,178 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from lexpy.frozen import load
+
+__all__ = ["ParallelLexicon"]
+
+# Lexicon opened by `_attach` in every worker process
+_LEXICON = None
+
+
+def _attach(path, mmap):
+    global _LEXICON
+    _LEXICON = load(path, mmap=mmap)
+
+
+def _run(method, queries, kwargs):
+    return getattr(_LEXICON, method)(queries, **kwargs)
+
+
+class ParallelLexicon:
+    """
+    Runs the queries of a lexicon in a pool of worker processes.
+
+    The lexicon is saved once in the lexpy binary format and every worker
+    memory maps the file with `lexpy.load`, so the workers share the same
+    pages instead of receiving a pickled copy of the automaton. Only the
+    queries and their results are sent between processes.
+
+    Example:
+        >>> from lexpy import DAWG
+        >>> from lexpy.parallel import ParallelLexicon
+        >>> dawg = DAWG()
+        >>> dawg.add_all(['tap', 'taps', 'top', 'tops'])
+        >>> dawg.reduce()
+        >>> with ParallelLexicon(dawg, workers=2) as lexicon:
+        ...     lexicon.search_many(['t?p', 'to*'])
+        [['tap', 'top'], ['top', 'tops']]
+    """
+
+    def __init__(self, lexicon, workers=None, mmap=True, mp_context=None):
+        """
+        Description:
+            Starts the worker processes.
+
+        Args:
+            :arg lexicon (str or lexpy._base.automata.FSA) A `Trie`, `DAWG`
+            or `FrozenFSA`, or the path of a file written by `save`. An
+            automaton is saved to a temporary file removed by `close`.
+
+            :arg workers (int) The number of worker processes. Default is
+            the number of CPUs.
+
+            :arg mmap (bool) Memory map the file in the workers. Default is
+            True.
+
+            :arg mp_context (multiprocessing.context.BaseContext) The
+            multiprocessing context of the pool.
+        """
+        self._tmp = None
+        if isinstance(lexicon, (str, os.PathLike)):
+            path = os.fspath(lexicon)
+        else:
+            fd, path = tempfile.mkstemp(suffix=".lexpy")
+            os.close(fd)
+            self._tmp = path
+            try:
+                lexicon.save(path)
+            except BaseException:
+                os.remove(path)
+                raise
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_attach,
+            initargs=(path, mmap),
+        )
+
+    def _submit(self, method, queries, kwargs):
+        return self._executor.submit(_run, method, queries, kwargs)
+
+    def _map(self, method, queries, chunksize, kwargs):
+        queries = list(queries)
+        if not queries:
+            return []
+        if chunksize is None:
+            chunksize = -(-len(queries) // (self.workers * 4))
+        futures = [
+            self._submit(method, queries[i : i + chunksize], kwargs)
+            for i in range(0, len(queries), chunksize)
+        ]
+        result = []
+        for future in futures:
+            result.extend(future.result())
+        return result
+
+    def __contains__(self, word):
+        return self._submit("contains_many", [word], {}).result()[0]
+
+    def search(self, wildcard, **kwargs):
+        """
+        Description:
+            Runs `search` in a worker process. The keyword arguments are the
+            same as in `FSA.search`.
+        """
+        return self._submit("search_many", [wildcard], kwargs).result()[0]
+
+    def search_within_distance(self, word, dist=0, **kwargs):
+        """
+        Description:
+            Runs `search_within_distance` in a worker process. The keyword
+            arguments are the same as in `FSA.search_within_distance`.
+        """
+        kwargs["dist"] = dist
+        return self._submit("search_within_distance_many", [word], kwargs).result()[0]
+
+    def contains_many(self, words, chunksize=None):
+        """
+        Description:
+            Checks the presence of every word of a batch. The batch is split
+            in chunks of `chunksize` words answered by the workers.
+
+        Args:
+            :arg words (iterable) The words to check.
+
+            :arg chunksize (int) The number of words sent to a worker at a
+            time. Default splits the batch in four chunks per worker.
+
+        Returns:
+            :returns (list) A boolean for every word, in input order.
+        """
+        return self._map("contains_many", words, chunksize, {})
+
+    def search_many(self, wildcards, chunksize=None, **kwargs):
+        """
+        Description:
+            Runs `search` for every wildcard pattern of a batch, split in
+            chunks of `chunksize` patterns. The keyword arguments are the
+            same as in `FSA.search`.
+
+        Returns:
+            :returns (list) The list of words of every pattern, in input order.
+        """
+        return self._map("search_many", wildcards, chunksize, kwargs)
+
+    def search_within_distance_many(self, words, dist=0, chunksize=None, **kwargs):
+        """
+        Description:
+            Runs `search_within_distance` for every word of a batch, split in
+            chunks of `chunksize` words. The keyword arguments are the same as
+            in `FSA.search_within_distance`.
+
+        Returns:
+            :returns (list) The list of similar words of every word, in input
+            order.
+        """
+        kwargs["dist"] = dist
+        return self._map("search_within_distance_many", words, chunksize, kwargs)
+
+    def close(self):
+        """
+        Description:
+            Shuts the worker processes down and removes the temporary file
+            of the lexicon.
+        """
+        self._executor.shutdown()
+        if self._tmp is not None:
+            os.remove(self._tmp)
+            self._tmp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,264 @@
+from lexpy._base.node import CompactRadixNode, RadixNode
+from lexpy._base.automata import FSA
+
+__all__ = ["RadixTrie"]
+
+
+class RadixTrie(FSA):
+    """
+    Path compressed trie, also known as a radix tree or a Patricia trie.
+
+    A chain of nodes with a single child and no word ending in them is
+    stored as one node whose edge is labelled with the whole substring, so
+    a set of long words sharing few branching points (URLs, product codes)
+    needs one node per branching point or word instead of one node per
+    letter.
+
+    The query methods see a node in the middle of an edge as the position
+    (node, offset), `offset` letters into the label of `node`, so wildcard
+    and fuzzy searches run unchanged over the compressed edges. Freezing
+    expands the edges back into one node per letter.
+
+    """
+
+    __slots__ = "root", "_num_of_nodes"
+
+    def __init__(self, compact=False):
+        """Initialize a RadixTrie
+
+        Description:
+            This method initializes a RadixTrie instance by adding the root
+            node. The label of the root node is an empty string ''
+
+        Args:
+            compact (bool): Store the children of every node in arrays
+                instead of a dict. Default is False.
+        """
+        root = (CompactRadixNode if compact else RadixNode)(0, "")
+        super(RadixTrie, self).__init__(root)
+        self._num_of_nodes = 1
+
+    def __len__(self):
+        """Returns the number of nodes in the RadixTrie
+
+        Returns:
+            length (int) -> Number of Nodes in the radix trie data structure
+        """
+        return self._num_of_nodes
+
+    def _child(self, node, letter):
+        if node.__class__ is tuple:
+            node, i = node
+            if node.val[i] != letter:
+                return None
+            i += 1
+            return node if i == len(node.val) else (node, i)
+        node = node.children.get(letter)
+        if node is None or len(node.val) == 1:
+            return node
+        return node, 1
+
+    def _children(self, node):
+        if node.__class__ is tuple:
+            node, i = node
+            label = node.val
+            return ((label[i], node if i + 1 == len(label) else (node, i + 1)),)
+        return [
+            (letter, child if len(child.val) == 1 else (child, 1))
+            for letter, child in node.children.items()
+        ]
+
+    def _eow(self, node):
+        return node.__class__ is not tuple and node.eow
+
+    def _count(self, node):
+        return 0 if node.__class__ is tuple else node.count
+
+    def _max_count(self, node):
+        if node.__class__ is tuple:
+            return node[0].max_count
+        return node.max_count
+
+    def _words_below(self, node):
+        if node.__class__ is tuple:
+            return node[0].num_of_words
+        return node.num_of_words
+
+    def __contains__(self, word):
+        if word == "":
+            return True
+        if word is None:
+            return False
+        node = self.root
+        i = 0
+        while i < len(word):
+            node = node.children.get(word[i])
+            if node is None or not word.startswith(node.val, i):
+                return False
+            i += len(node.val)
+        return node.eow
+
+    def _iter_subtree(self, node, letters, with_count=False):
+        """
+        Description:
+            Yields every word below `node` in depth first order, appending
+            the whole label of an edge to `letters` at once.
+        """
+        if node.__class__ is tuple:
+            node, i = node
+            letters.append(node.val[i:])
+            yield from self._iter_subtree(node, letters, with_count)
+            letters.pop()
+            return
+        if letters and node.eow:
+            word = "".join(letters)
+            yield (word, node.count) if with_count else word
+        stack = [iter(node.children.values())]
+        while stack:
+            for node in stack[-1]:
+                letters.append(node.val)
+                if node.eow:
+                    word = "".join(letters)
+                    yield (word, node.count) if with_count else word
+                stack.append(iter(node.children.values()))
+                break
+            else:
+                stack.pop()
+                if stack:
+                    letters.pop()
+
+    def add(self, word: str, count: int = 1):
+        """Adds a word in the radix trie
+
+        Description:
+            Add a word and optionally specify the count. An edge sharing
+            only part of its label with the word is split in two. A negative
+            count is subtracted from the count of the word, which is removed
+            when its count drops to zero.
+
+        Args:
+            word (str) : The word that you want to insert in the radix trie.
+            count (int): Count of the word. Default value is 1.
+
+        Raises:
+            ValueError if the word is None
+
+        """
+        if word is None:
+            raise ValueError("Input word cannot be None")
+
+        if count < 0:
+            self._discount(word, -count)
+            return
+        if not word:
+            return
+
+        self._version += 1
+        node = self.root
+        path = [node]
+        i = 0
+        while i < len(word):
+            child = node.children.get(word[i])
+            if child is None:
+                self._id += 1
+                self._num_of_nodes += 1
+                child = node.children[word[i]] = type(node)(self._id, word[i:])
+                i = len(word)
+            else:
+                label = child.val
+                j = 1
+                n = min(len(label), len(word) - i)
+                while j < n and label[j] == word[i + j]:
+                    j += 1
+                if j < len(label):
+                    child = self._split(node, child, j)
+                i += j
+            node = child
+            path.append(node)
+
+        if not node.eow:
+            for path_node in path:
+                path_node.num_of_words += 1
+            if self._suffix_index is not None:
+                self._suffix_index.add(word)
+        node.eow = True
+        node.count += count
+        self._num_of_words += count
+        for path_node in reversed(path):
+            if path_node.max_count >= node.count:
+                break
+            path_node.max_count = node.count
+
+    def _split(self, parent, node, i):
+        """
+        Description:
+            Splits the edge leading to `node` after the first `i` letters of
+            its label and returns the new node in the middle.
+        """
+        label = node.val
+        self._id += 1
+        self._num_of_nodes += 1
+        middle = type(node)(self._id, label[:i])
+        middle.max_count = node.max_count
+        middle.num_of_words = node.num_of_words
+        node.val = label[i:]
+        middle.children[node.val[0]] = node
+        parent.children[label[0]] = middle
+        return middle
+
+    def _merge(self, parent, node):
+        """
+        Description:
+            Merges `node`, which has a single child and no word ending in
+            it, with its child.
+        """
+        (child,) = node.children.values()
+        child.val = node.val + child.val
+        parent.children[node.val[0]] = child
+        self._num_of_nodes -= 1
+
+    def _discount(self, word, count=None):
+        """
+        Description:
+            Subtracts `count` from the count of `word`, or removes the word
+            if `count` is None or at least its count. A node left without a
+            word below it is deleted and a node left with a single child is
+            merged with it.
+
+        Returns:
+            :returns (bool) True if the word was in the radix trie
+        """
+        if not isinstance(word, str) or not word:
+            return False
+        node = self.root
+        path = [node]
+        i = 0
+        while i < len(word):
+            node = node.children.get(word[i])
+            if node is None or not word.startswith(node.val, i):
+                return False
+            i += len(node.val)
+            path.append(node)
+        if not node.eow:
+            return False
+
+        self._version += 1
+        if count is None or count >= node.count:
+            count = node.count
+            node.eow = False
+            if self._suffix_index is not None:
+                self._suffix_index.remove(word)
+        node.count -= count
+        self._num_of_words -= count
+        if not node.eow:
+            if not node.children:
+                del path[-2].children[node.val[0]]
+                self._num_of_nodes -= 1
+                path.pop()
+                node = path[-1]
+            if len(path) > 1 and not node.eow and len(node.children) == 1:
+                self._merge(path[-2], node)
+                path.pop()
+        for path_node in reversed(path):
+            path_node.update_max_count()
+        return True
@@ -1,8 +1,14 @@
+import io
 import os
+import random
+import tempfile
 import unittest
+from unittest import mock
 
-from lexpy import DAWG
-from lexpy.utils import build_dawg_from_file
+from lexpy import DAWG, Trie
+from lexpy._base.node import FSANode
+from lexpy._utils import external_sort
+from lexpy.utils import build_dawg_from_file, keyboard_substitution_costs
 
 HERE = os.path.dirname(__file__)
 
@@ -153,7 +159,187 @@ class TestDAWGNodeCount(unittest.TestCase):
         self.dawg = DAWG()
         self.dawg.add_all(["tap", "taps", "top", "tops"])
         self.dawg.reduce()
-        self.assertEqual(6, len(self.dawg), "Number of nodes")
+        # t, the node shared by 'ta' and 'to', p and s
+        self.assertEqual(4, len(self.dawg), "Number of nodes")
+
+
+class TestNodeSignature(unittest.TestCase):
+
+    def test_signature_equal_nodes(self):
+        child = FSANode(3, "s")
+        child.eow, child.count = True, 1
+        first, second = FSANode(1, "p"), FSANode(2, "p")
+        for node in (first, second):
+            node.eow, node.count = True, 1
+            node.children["s"] = child
+        self.assertEqual((True, 1, "s", 3), first.signature())
+        self.assertEqual(first.signature(), second.signature())
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+
+    def test_signature_no_string_collision(self):
+        # Both nodes used to have the string representation 'a11075'
+        first, second = FSANode(1, "a"), FSANode(2, "a")
+        first.count = 11
+        first.children["7"] = FSANode(5, "7")
+        second.count, second.eow = 1, True
+        second.children["0"] = FSANode(75, "0")
+        self.assertEqual(str(first), str(second))
+        self.assertNotEqual(first.signature(), second.signature())
+        self.assertNotEqual(first, second)
+
+
+class TestIncrementalDAWG(unittest.TestCase):
+
+    words = ["tap", "taps", "top", "tops", "stop", "stops", "ash", "ashes", "as"]
+
+    def assert_minimal(self, dawg, counts):
+        """The DAWG holds `counts` and is as small as the DAWG built in order"""
+        dawg.reduce()
+        self.assertListEqual(
+            sorted(counts.items()), sorted(dawg.search("*", with_count=True))
+        )
+        self.assertEqual(sum(counts.values()), dawg.get_word_count())
+        expected = DAWG()
+        for word in sorted(counts):
+            expected.add(word, counts[word])
+        expected.reduce()
+        self.assertEqual(len(expected), len(dawg), "Number of nodes")
+        self.assertEqual(len(expected.freeze()), len(dawg.freeze()))
+
+    def test_add_unsorted(self):
+        self.dawg = DAWG(incremental=True)
+        counts = {}
+        for word in self.words:
+            self.dawg.add(word)
+            counts[word] = 1
+            self.assert_minimal(self.dawg, counts)
+        self.dawg.add("tap", count=3)
+        counts["tap"] = 4
+        self.assert_minimal(self.dawg, counts)
+
+    def test_add_unsorted_not_incremental(self):
+        self.dawg = DAWG()
+        self.dawg.add("tap")
+        with self.assertRaises(ValueError):
+            self.dawg.add("ash")
+
+    def test_add_after_reduce(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(["ash", "tap"])
+        self.dawg.reduce()
+        self.dawg.add_all(["tape", "tapes", "top"])
+        self.dawg.add("top", count=2)
+        self.dawg.reduce()
+        self.assert_minimal(
+            self.dawg, {"ash": 1, "tap": 1, "tape": 1, "tapes": 1, "top": 3}
+        )
+        self.dawg.add("top")
+        self.assert_minimal(
+            self.dawg, {"ash": 1, "tap": 1, "tape": 1, "tapes": 1, "top": 4}
+        )
+
+    def test_remove(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(self.words)
+        self.dawg.reduce()
+        counts = dict.fromkeys(self.words, 1)
+        for word in ["taps", "as", "ash", "stops", "zebra", "ta"]:
+            self.assertEqual(word in counts, self.dawg.remove(word))
+            counts.pop(word, None)
+            self.assert_minimal(self.dawg, counts)
+        self.assertFalse("taps" in self.dawg, "Word should not be in dawg")
+        self.assertTrue(self.dawg.contains_prefix("ashe"))
+        self.assertFalse(self.dawg.contains_prefix("stops"))
+        for word in list(counts):
+            self.dawg.remove(word)
+        self.assertEqual(0, len(self.dawg), "Number of nodes")
+        self.assertEqual(0, self.dawg.get_word_count(), "Word count not equal")
+        self.dawg.add("zoo")
+        self.assert_minimal(self.dawg, {"zoo": 1})
+
+    def test_random_updates(self):
+        rng = random.Random(7)
+        self.dawg = DAWG(incremental=True)
+        counts = {}
+        for _ in range(300):
+            word = "".join(rng.choice("abc") for _ in range(rng.randint(1, 5)))
+            if word in counts and rng.random() < 0.4:
+                self.assertTrue(self.dawg.remove(word))
+                del counts[word]
+            else:
+                self.dawg.add(word)
+                counts[word] = counts.get(word, 0) + 1
+        self.assert_minimal(self.dawg, counts)
+        top = self.dawg.top_k_with_prefix("", 3, with_count=True)
+        self.assertListEqual(
+            sorted(counts.values(), reverse=True)[:3], [count for _, count in top]
+        )
+        self.assertTrue(all(counts[word] == count for word, count in top))
+
+    def test_compact_nodes(self):
+        rng = random.Random(11)
+        self.dawg = DAWG(incremental=True, compact=True)
+        counts = {}
+        for _ in range(300):
+            word = "".join(rng.choice("abc") for _ in range(rng.randint(1, 5)))
+            if word in counts and rng.random() < 0.4:
+                self.assertTrue(self.dawg.remove(word))
+                del counts[word]
+            else:
+                self.dawg.add(word)
+                counts[word] = counts.get(word, 0) + 1
+        self.assert_minimal(self.dawg, counts)
+
+
+class TestWordIndex(unittest.TestCase):
+
+    def test_index_of(self):
+        words = ["as", "ash", "ashes", "ashley", "bat", "bats", "tap", "taps", "top"]
+        self.dawg = DAWG(incremental=True)
+        self.dawg.add_all(reversed(words))
+        self.dawg.reduce()
+        frozen = self.dawg.freeze()
+        for i, word in enumerate(words):
+            self.assertEqual(i, self.dawg.index_of(word))
+            self.assertEqual(word, self.dawg.word_at(i))
+            self.assertEqual(i, frozen.index_of(word))
+            self.assertEqual(word, frozen.word_at(i))
+        with self.assertRaises(ValueError):
+            self.dawg.index_of("c")
+        with self.assertRaises(IndexError):
+            frozen.word_at(len(words))
+
+
+class TestSuffixIndex(unittest.TestCase):
+
+    def test_suffix_index(self):
+        self.dawg = DAWG(incremental=True)
+        self.dawg.add_all(["action", "cat", "nation", "scatter"])
+        self.dawg.reduce()
+        self.dawg.build_suffix_index()
+        self.dawg.add("station")
+        self.dawg.add("bat")
+        self.dawg.remove("nation")
+        self.assertListEqual(["action", "station"], self.dawg.search("*tion"))
+        self.assertListEqual(["bat", "cat"], self.dawg.search_with_suffix("at"))
+        self.assertListEqual(["cat", "scatter"], self.dawg.search_with_substring("cat"))
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_cache_invalidation(self):
+        self.dawg = DAWG(incremental=True)
+        self.dawg.add_all(["tap", "taps", "top"])
+        self.dawg.enable_query_cache()
+        self.assertListEqual(["tap", "taps", "top"], self.dawg.search("t*"))
+        self.dawg.add("atop")
+        self.dawg.remove("taps")
+        self.assertListEqual(["tap", "top"], self.dawg.search("t*"))
+        self.dawg.reduce()
+        self.assertListEqual(["tap", "top"], self.dawg.search("t*"))
+        self.assertListEqual(["tap", "top"], self.dawg.search("t*"))
+        self.assertEqual((1, 3), self.dawg.query_cache_info()[:2])
 
 
 class TestDAWGPrefixExists(unittest.TestCase):
@@ -292,6 +478,15 @@ class TestWildCardSearch(unittest.TestCase):
         self.assertTrue("ashley" in self.dawg, "Word should be in dawg")
         self.assertTrue("#$%^a" in self.dawg)
 
+    def test_dawg_wildcard_shared_nodes(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(["aoo", "boo", "booboo", "eoeo", "oboe", "zoo"])
+        self.dawg.reduce()
+        self.assertListEqual(
+            ["aoo", "boo", "booboo", "eoeo", "zoo"], self.dawg.search("*o*o")
+        )
+        self.assertListEqual(["booboo"], self.dawg.search("*o*o*o*"))
+
     #  self.assertRaises(InvalidWildCardExpressionError, self.dawg.search, '#$%^a')
 
 
@@ -320,6 +515,123 @@ class TestBuildFromFile(unittest.TestCase):
         self.assertEqual(178691, self.dawg.get_word_count(), "Word count not equal")
 
 
+class TestBuildParallel(unittest.TestCase):
+
+    def assert_same_dawg(self, expected, dawg):
+        self.assertIsInstance(dawg, DAWG, "Object should be of type `lexpy.dawg.DAWG`")
+        self.assertEqual(len(expected), len(dawg), "Number of nodes")
+        self.assertEqual(
+            expected.get_word_count(), dawg.get_word_count(), "Word count not equal"
+        )
+        self.assertListEqual(
+            expected.search("*", with_count=True), dawg.search("*", with_count=True)
+        )
+        frozen, other = expected.freeze(), dawg.freeze()
+        self.assertListEqual(list(frozen._targets), list(other._targets))
+        self.assertListEqual(list(frozen._max_counts), list(other._max_counts))
+
+    def test_build_parallel(self):
+        words = ["tap", "taps", "top", "tops", "stop", "stops", "atop", "atops"]
+        self.dawg = DAWG.build_parallel(words, workers=2, shard_size=1)
+        expected = DAWG()
+        expected.add_all(words)
+        expected.reduce()
+        self.assert_same_dawg(expected, self.dawg)
+
+    def test_build_parallel_duplicates(self):
+        words = ["ash", "ash", "ashley", "bat", "bat", "bat", "cat"]
+        self.dawg = DAWG.build_parallel(iter(words), workers=2, shard_size=2)
+        self.assertListEqual(
+            [("ash", 2), ("ashley", 1), ("bat", 3), ("cat", 1)],
+            self.dawg.search("*", with_count=True),
+        )
+        self.assertListEqual([("bat", 3)], self.dawg.top_k_with_prefix("", 1, True))
+
+    def test_build_parallel_file(self):
+        source = io.StringIO("ash\nashes\nashley\nbat\nbats\n")
+        self.dawg = DAWG.build_parallel(source, workers=2, shard_size=1)
+        self.assertTrue("ashes" in self.dawg, "Word should be in dawg")
+        self.assertTrue("bats" in self.dawg, "Word should be in dawg")
+        self.assertEqual(5, self.dawg.get_word_count(), "Word count not equal")
+
+    def test_build_parallel_unsorted(self):
+        with self.assertRaises(ValueError):
+            DAWG.build_parallel(iter(["tap", "ash"]), workers=1)
+
+
+class TestExternalSort(unittest.TestCase):
+
+    words = ["tops", "ash", "tap", "ashes", "ash", "top", "taps", "ash", "tap", "as"]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assert_counts(self, dawg):
+        self.assertListEqual(
+            [("as", 1), ("ash", 3), ("ashes", 1)], dawg.search("a*", with_count=True)
+        )
+        self.assertListEqual(
+            [("tap", 2), ("taps", 1), ("top", 1), ("tops", 1)],
+            dawg.search("t*", with_count=True),
+        )
+        self.assertEqual(10, dawg.get_word_count(), "Word count not equal")
+        self.assertListEqual([], os.listdir(self.tmpdir.name), "Temporary files")
+
+    def test_add_all_sort(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(
+            iter(self.words), sort=True, chunk_size=2, tmpdir=self.tmpdir.name
+        )
+        self.dawg.reduce()
+        self.assert_counts(self.dawg)
+
+    def test_add_all_sort_file(self):
+        source = io.StringIO("\n".join(self.words))
+        self.dawg = DAWG()
+        self.dawg.add_all(source, sort=True, chunk_size=3, tmpdir=self.tmpdir.name)
+        self.dawg.reduce()
+        self.assert_counts(self.dawg)
+
+    def test_add_all_sort_in_memory(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(self.words, sort=True, tmpdir=self.tmpdir.name)
+        self.dawg.reduce()
+        self.assert_counts(self.dawg)
+
+    def test_add_all_sort_skips_blank_lines(self):
+        text = "ash\t4\nashes\t9\n\nbat\t20\n"
+        trie = Trie()
+        trie.add_all(io.StringIO(text), with_count=True)
+        self.dawg = DAWG()
+        self.dawg.add_all(
+            io.StringIO(text), with_count=True, sort=True, tmpdir=self.tmpdir.name
+        )
+        self.dawg.reduce()
+        self.assertEqual(trie.get_word_count(), self.dawg.get_word_count())
+        self.assertEqual(33, self.dawg.get_word_count(), "Word count not equal")
+        self.assertFalse(self.dawg.root.eow, "Empty word added")
+        self.assertListEqual(
+            trie.search("*", with_count=True), self.dawg.search("*", with_count=True)
+        )
+
+    def test_external_sort_merge_passes(self):
+        pairs = [(word, i) for i, word in enumerate(self.words)]
+        expected = {}
+        for word, count in pairs:
+            expected[word] = expected.get(word, 0) + count
+        with mock.patch("lexpy._utils.MAX_MERGE_RUNS", 2):
+            result = list(external_sort(pairs, chunk_size=1, tmpdir=self.tmpdir.name))
+        self.assertListEqual(sorted(expected.items()), result)
+        self.assertListEqual([], os.listdir(self.tmpdir.name), "Temporary files")
+
+    def test_external_sort_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            list(external_sort(self.words, chunk_size=0))
+
+
 class TestSearchWithinDistance(unittest.TestCase):
 
     def test_edit_distance_search(self):
@@ -373,6 +685,73 @@ class TestSearchWithinDistance(unittest.TestCase):
             ["arbil", "athie", "auric"],
         )
 
+    def test_edit_distance_engines(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(["ash", "ashes", "ashley", "bash", "cash", "sash", "shy"])
+        self.dawg.reduce()
+        for dist in range(4):
+            expected = self.dawg.search_within_distance("ashy", dist, engine="dp")
+            for engine in ("banded", "automaton"):
+                self.assertListEqual(
+                    expected,
+                    self.dawg.search_within_distance("ashy", dist, engine=engine),
+                )
+        self.assertListEqual(
+            ["ash", "ashes", "ashley", "bash", "cash", "sash", "shy"],
+            self.dawg.search_within_distance("ashy", 2),
+        )
+
+    def test_edit_distance_transpositions(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(["form", "from", "fro", "frog"])
+        self.dawg.reduce()
+        self.assertListEqual(["form"], self.dawg.search_within_distance("form", 0))
+        self.assertListEqual(["form"], self.dawg.search_within_distance("form", 1))
+        for engine in ("dp", "banded", "automaton"):
+            self.assertListEqual(
+                ["form", "from"],
+                self.dawg.search_within_distance(
+                    "form", 1, engine=engine, transpositions=True
+                ),
+            )
+            self.assertListEqual(
+                ["form"],
+                self.dawg.search_within_distance(
+                    "fomr", 1, engine=engine, transpositions=True
+                ),
+            )
+
+    def test_edit_distance_costs(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(["cap", "cat", "cats", "ct"])
+        self.dawg.reduce()
+        for engine in ("dp", "banded", "automaton"):
+            self.assertListEqual(
+                ["cats"],
+                self.dawg.search_within_distance(
+                    "cat", 0.5, engine=engine, costs={"insert": 0.5}
+                )[1:],
+            )
+            self.assertListEqual(
+                ["cap"],
+                self.dawg.search_within_distance(
+                    "cao",
+                    0.5,
+                    engine=engine,
+                    substitution_costs=keyboard_substitution_costs(),
+                ),
+            )
+        with self.assertRaises(ValueError):
+            self.dawg.search_within_distance("cat", 1, costs={"swap": 1})
+        with self.assertRaises(ValueError):
+            self.dawg.search_within_distance("cat", 1, costs={"delete": 0})
+
+    def test_edit_distance_unknown_engine(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(["ash"])
+        with self.assertRaises(ValueError):
+            self.dawg.search_within_distance("ash", 1, engine="myers")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,262 @@
+import os
+import tempfile
+import unittest
+
+from lexpy import Trie, DAWG, FrozenFSA, load
+
+HERE = os.path.dirname(__file__)
+
+large_dataset = os.path.join(HERE, "data/words100k.txt")
+
+input_words = [
+    "abhor",
+    "abuzz",
+    "accept",
+    "acorn",
+    "agony",
+    "albay",
+    "albin",
+    "algin",
+    "alisa",
+    "almug",
+    "altai",
+    "amato",
+    "ampyx",
+    "aneto",
+    "arbil",
+    "arrow",
+    "artha",
+    "aruba",
+    "athie",
+    "auric",
+    "aurum",
+    "cap",
+    "common",
+    "dime",
+    "eyes",
+    "foot",
+    "likeablelanguage",
+    "lonely",
+    "look",
+    "nasty",
+    "pet",
+    "psychotic",
+    "quilt",
+    "shock",
+    "smalldusty",
+    "sore",
+    "steel",
+    "suit",
+    "tank",
+    "thrill",
+]
+
+
+class TestFreezeTrie(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie()
+        self.trie.add_all(input_words)
+        self.trie.add("athie", count=2)
+        self.frozen = self.trie.freeze()
+
+    def test_freeze_type(self):
+        self.assertIsInstance(
+            self.frozen, FrozenFSA, "Object should be of type `FrozenFSA`"
+        )
+        self.assertEqual(len(self.trie), len(self.frozen), "Number of nodes")
+        self.assertEqual(
+            self.trie.get_word_count(),
+            self.frozen.get_word_count(),
+            "Word count not equal",
+        )
+
+    def test_word_in_frozen(self):
+        for word in input_words:
+            self.assertTrue(word in self.frozen, "Word should be in frozen trie")
+        self.assertFalse("abho" in self.frozen, "Word should not be in frozen trie")
+        self.assertFalse("abhorr" in self.frozen, "Word should not be in frozen trie")
+        self.assertFalse(None in self.frozen)
+
+    def test_prefix(self):
+        self.assertTrue(self.frozen.contains_prefix("ab"))
+        self.assertFalse(self.frozen.contains_prefix("xy"))
+        self.assertListEqual(["abhor", "abuzz"], self.frozen.search_with_prefix("ab"))
+
+    def test_search(self):
+        self.assertListEqual(
+            sorted(self.trie.search("a*o*", with_count=True)),
+            sorted(self.frozen.search("a*o*", with_count=True)),
+        )
+        self.assertListEqual(
+            [("athie", 3)], self.frozen.search("a?hie", with_count=True)
+        )
+
+    def test_search_within_distance(self):
+        self.assertListEqual(
+            ["arbil", "athie", "auric"],
+            self.frozen.search_within_distance("arie", dist=2),
+        )
+
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            self.frozen.add("zebra")
+        with self.assertRaises(TypeError):
+            self.frozen.add_all(["zebra"])
+        with self.assertRaises(TypeError):
+            self.frozen.remove("abhor")
+
+
+class TestFreezeDAWG(unittest.TestCase):
+
+    def test_freeze_dawg(self):
+        dawg = DAWG()
+        dawg.add_all(["tap", "taps", "top", "tops"])
+        dawg.reduce()
+        frozen = dawg.freeze()
+        self.assertEqual(4, frozen.get_word_count(), "Word count not equal")
+        self.assertEqual(5, len(frozen), "Number of nodes")
+        self.assertListEqual(["tap", "taps", "top", "tops"], frozen.search("t*"))
+
+    def test_freeze_dawg_queries(self):
+        dawg = DAWG()
+        dawg.add_all(input_words)
+        dawg.reduce()
+        frozen = dawg.freeze()
+        for word in input_words:
+            self.assertTrue(word in frozen, "Word should be in frozen dawg")
+        self.assertListEqual(dawg.search("*"), frozen.search("*"))
+        self.assertListEqual(
+            dawg.search_within_distance("arie", dist=2),
+            frozen.search_within_distance("arie", dist=2),
+        )
+
+
+class TestDoubleArray(unittest.TestCase):
+
+    def setUp(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(input_words)
+        self.dawg.reduce()
+        self.frozen = self.dawg.freeze()
+        self.compiled = self.dawg.freeze(double_array=True)
+
+    def test_same_queries(self):
+        queries = input_words + ["abho", "abhorr", "zebra", "éclair", "a\U0001f600", ""]
+        for word in queries:
+            self.assertEqual(word in self.frozen, word in self.compiled, word)
+        self.assertListEqual(
+            self.frozen.contains_many(queries), self.compiled.contains_many(queries)
+        )
+        self.assertTrue(self.compiled.contains_prefix("psy"))
+        self.assertFalse(self.compiled.contains_prefix("psz"))
+        for wildcard in ["a*", "?o*", "*s?", "al?in"]:
+            self.assertListEqual(
+                self.frozen.search(wildcard), self.compiled.search(wildcard)
+            )
+        self.assertListEqual(
+            self.frozen.search_within_distance("arie", dist=2),
+            self.compiled.search_within_distance("arie", dist=2),
+        )
+
+    def test_freeze_frozen(self):
+        self.assertIs(self.compiled, self.compiled.freeze(double_array=True))
+        compiled = self.frozen.freeze(double_array=True)
+        self.assertIsNotNone(compiled._base)
+        self.assertListEqual(self.frozen.search("*"), compiled.search("*"))
+
+    def test_freeze_frozen_keeps_shared_nodes(self):
+        with open(large_dataset) as infile:
+            words = sorted({line.strip() for line in infile if line.strip()})
+        dawg = DAWG()
+        dawg.add_all(words[:5000])
+        dawg.reduce()
+        frozen = dawg.freeze()
+        self.assertGreater(len(frozen), 256)
+        compiled = frozen.freeze(double_array=True)
+        self.assertEqual(len(frozen), len(compiled))
+        self.assertListEqual(frozen.search("*"), compiled.search("*"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "words.lexpy")
+            frozen.save(path)
+            with load(path) as loaded:
+                compiled = loaded.freeze(double_array=True)
+                self.assertEqual(len(frozen), len(compiled))
+                self.assertEqual(words[:5000], compiled.search("*"))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "words.lexpy")
+            self.dawg.save(path, double_array=True)
+            with load(path) as frozen:
+                self.assertIsNotNone(frozen._base)
+                for word in input_words:
+                    self.assertTrue(word in frozen, "Word should be in loaded dawg")
+                self.assertFalse("thril" in frozen, "Word should not be in dawg")
+
+
+class TestSaveLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.dawg = DAWG()
+        self.dawg.add_all(input_words)
+        self.dawg.add("thrill", count=4)
+        self.dawg.reduce()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "words.lexpy")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assert_same_lexicon(self, frozen):
+        self.assertIsInstance(frozen, FrozenFSA)
+        self.assertEqual(
+            self.dawg.get_word_count(), frozen.get_word_count(), "Word count"
+        )
+        for word in input_words:
+            self.assertTrue(word in frozen, "Word should be in loaded dawg")
+        self.assertFalse("thril" in frozen, "Word should not be in loaded dawg")
+        self.assertListEqual(
+            self.dawg.search("*", with_count=True), frozen.search("*", with_count=True)
+        )
+        self.assertListEqual(
+            ["arbil", "athie", "auric"], frozen.search_within_distance("arie", dist=2)
+        )
+
+    def test_save_load_mmap(self):
+        self.dawg.save(self.path)
+        with load(self.path) as frozen:
+            self.assert_same_lexicon(frozen)
+
+    def test_save_load_without_mmap(self):
+        self.dawg.save(self.path)
+        frozen = load(self.path, mmap=False)
+        self.assert_same_lexicon(frozen)
+
+    def test_resave_loaded(self):
+        self.dawg.save(self.path)
+        other = os.path.join(self.tmpdir.name, "copy.lexpy")
+        with load(self.path) as frozen:
+            frozen.save(other)
+        with load(other) as frozen:
+            self.assert_same_lexicon(frozen)
+
+    def test_trie_save_load(self):
+        trie = Trie()
+        trie.add_all(["ash", "ashley", "ashes", "ashes"])
+        trie.save(self.path)
+        with load(self.path) as frozen:
+            self.assertListEqual(
+                [("ash", 1), ("ashes", 2), ("ashley", 1)],
+                frozen.search("a*", with_count=True),
+            )
+
+    def test_load_invalid_file(self):
+        with open(self.path, "wb") as out:
+            out.write(b"ash\nashley\n")
+        with self.assertRaises(ValueError):
+            load(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
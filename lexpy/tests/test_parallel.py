@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from lexpy import DAWG, ParallelLexicon, Trie
+
+input_words = [
+    "ash",
+    "ashes",
+    "ashley",
+    "asp",
+    "bat",
+    "cap",
+    "cop",
+    "tap",
+    "taps",
+    "top",
+    "tops",
+]
+
+
+class TestParallelLexicon(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dawg = DAWG()
+        cls.dawg.add_all(input_words)
+        cls.dawg.reduce()
+        cls.lexicon = ParallelLexicon(cls.dawg, workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        path = cls.lexicon.path
+        cls.lexicon.close()
+        assert not os.path.exists(path), "Temporary file should be removed"
+
+    def test_contains(self):
+        self.assertTrue("ashes" in self.lexicon)
+        self.assertFalse("ashe" in self.lexicon)
+
+    def test_contains_many(self):
+        words = input_words + ["as", "tapss", "", None] + input_words
+        self.assertListEqual(
+            self.dawg.contains_many(words),
+            self.lexicon.contains_many(words, chunksize=3),
+        )
+        self.assertListEqual([], self.lexicon.contains_many([]))
+
+    def test_search(self):
+        self.assertListEqual(
+            self.dawg.search("t?p*", with_count=True),
+            self.lexicon.search("t?p*", with_count=True),
+        )
+        self.assertListEqual(
+            self.dawg.search_many(["a*", "?o?", "x*"]),
+            self.lexicon.search_many(["a*", "?o?", "x*"]),
+        )
+
+    def test_search_within_distance(self):
+        self.assertListEqual(
+            ["cap", "cop"],
+            self.lexicon.search_within_distance("cup", dist=1),
+        )
+        words = ["cup", "asx", "taps"]
+        self.assertListEqual(
+            self.dawg.search_within_distance_many(words, dist=1, transpositions=True),
+            self.lexicon.search_within_distance_many(
+                words, dist=1, transpositions=True, chunksize=1
+            ),
+        )
+
+
+class TestParallelLexiconFromFile(unittest.TestCase):
+
+    def test_from_path(self):
+        trie = Trie()
+        trie.add_all(input_words)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "words.lexpy")
+            trie.save(path)
+            with ParallelLexicon(path, workers=1, mmap=False) as lexicon:
+                self.assertListEqual(["ash", "asp"], lexicon.search("as?"))
+            self.assertTrue(os.path.exists(path), "Saved file should be kept")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import unittest
+
+from lexpy import RadixTrie, Trie
+
+HERE = os.path.dirname(__file__)
+
+large_dataset = os.path.join(HERE, "data/words100k.txt")
+
+URLS = [
+    "https://example.com/products/sku-10042",
+    "https://example.com/products/sku-10043",
+    "https://example.com/about",
+]
+
+
+class TestRadixTrieInsert(unittest.TestCase):
+
+    def test_word_add(self):
+        self.radix_trie = RadixTrie()
+        self.radix_trie.add_all(["ash", "ashley", "ashes", "ab"])
+        self.assertTrue("ash" in self.radix_trie, "Word should be in radix trie")
+        self.assertTrue("ab" in self.radix_trie, "Word should be in radix trie")
+        self.assertFalse("as" in self.radix_trie, "Word should not be in radix trie")
+        self.assertFalse("ashe" in self.radix_trie, "Word should not be in radix trie")
+        self.assertEqual(4, self.radix_trie.get_word_count(), "Word count not equal")
+
+    def test_node_count(self):
+        self.radix_trie = RadixTrie()
+        self.radix_trie.add_all(URLS)
+        # root, 'https://example.com/', 'products/sku-1004', '2', '3', 'about'
+        self.assertEqual(6, len(self.radix_trie), "Number of nodes")
+
+    def test_count(self):
+        self.radix_trie = RadixTrie()
+        self.radix_trie.add("ashley", count=3)
+        self.radix_trie.add("ash", count=2)
+        self.assertEqual(
+            [("ash", 2), ("ashley", 3)], self.radix_trie.search("a*", with_count=True)
+        )
+
+
+class TestRadixTrieRemove(unittest.TestCase):
+
+    def setUp(self):
+        self.radix_trie = RadixTrie()
+        self.radix_trie.add_all(["ash", "ashley", "ashes"])
+
+    def test_remove_merges_nodes(self):
+        self.assertTrue(self.radix_trie.remove("ashes"))
+        self.assertEqual(["ash", "ashley"], self.radix_trie.search("a*"))
+        # root, 'ash', 'ley'
+        self.assertEqual(3, len(self.radix_trie), "Number of nodes")
+
+    def test_remove_inner_word(self):
+        self.assertTrue(self.radix_trie.remove("ash"))
+        self.assertFalse("ash" in self.radix_trie, "Word should not be in radix trie")
+        self.assertEqual(["ashley", "ashes"], self.radix_trie.search("a*"))
+
+    def test_remove_missing(self):
+        self.assertFalse(self.radix_trie.remove("as"))
+        self.assertFalse(self.radix_trie.remove("ashy"))
+        self.assertEqual(3, self.radix_trie.get_word_count(), "Word count not equal")
+
+    def test_remove_all(self):
+        for word in ["ashley", "ash", "ashes"]:
+            self.assertTrue(self.radix_trie.remove(word))
+        self.assertEqual(1, len(self.radix_trie), "Number of nodes")
+        self.assertEqual(0, self.radix_trie.get_word_count(), "Word count not equal")
+
+
+class TestRadixTrieSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.radix_trie = RadixTrie()
+        self.radix_trie.add_all(URLS)
+
+    def test_prefix(self):
+        self.assertTrue(self.radix_trie.contains_prefix("https://example.com/pro"))
+        self.assertFalse(self.radix_trie.contains_prefix("https://example.com/x"))
+        self.assertEqual(
+            URLS[:2], self.radix_trie.search_with_prefix("https://example.com/p")
+        )
+
+    def test_wildcard(self):
+        self.assertEqual(URLS[:2], self.radix_trie.search("*/sku-1004?"))
+        self.assertEqual(URLS[2:], self.radix_trie.search("*ab?ut"))
+
+    def test_within_distance(self):
+        self.assertEqual(
+            URLS[2:],
+            self.radix_trie.search_within_distance("https://example.com/abot", dist=1),
+        )
+
+    def test_freeze(self):
+        frozen = self.radix_trie.freeze()
+        self.assertEqual(sorted(URLS), frozen.search("*"))
+
+    def test_iter_words(self):
+        self.assertListEqual(sorted(URLS), list(self.radix_trie.iter_words()))
+        self.assertListEqual(
+            sorted(sorted(URLS), key=len),
+            list(self.radix_trie.iter_words(order="length")),
+        )
+
+
+class TestRadixTrieMatchesTrie(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.trie = Trie()
+        cls.trie.add_all(large_dataset)
+        cls.radix_trie = RadixTrie()
+        cls.radix_trie.add_all(large_dataset)
+
+    def test_fewer_nodes(self):
+        self.assertEqual(self.trie.get_word_count(), self.radix_trie.get_word_count())
+        self.assertLess(len(self.radix_trie), len(self.trie))
+
+    def test_same_results(self):
+        for wildcard in ["ab*", "?ppl*", "*ing", "a*e?"]:
+            self.assertEqual(
+                self.trie.search(wildcard), self.radix_trie.search(wildcard)
+            )
+        self.assertEqual(
+            self.trie.search_within_distance("appel", dist=2),
+            self.radix_trie.search_within_distance("appel", dist=2),
+        )
+        self.assertEqual(
+            [count for _, count in self.trie.top_k_with_prefix("ap", 5, True)],
+            [count for _, count in self.radix_trie.top_k_with_prefix("ap", 5, True)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,15 @@
-import unittest
+import bz2
+import gzip
+import importlib.util
+import lzma
 import os
+import tempfile
+import unittest
 
 from lexpy import Trie
+from lexpy.exceptions import InvalidRegularExpressionError
+from lexpy._base.node import MAX_ARRAY_CHILDREN, CompactFSANode
+from lexpy._base.regex import compile_wildcard
 from lexpy.utils import build_trie_from_file
 
 
@@ -139,6 +147,106 @@ class TestTrieNodeCount(unittest.TestCase):
         self.assertEqual(7, len(self.trie), "Number of nodes")
 
 
+class TestTrieRemove(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie()
+        self.trie.add_all(["ash", "ashes", "ashley", "asp", "bat"])
+
+    def test_remove(self):
+        self.assertEqual(13, len(self.trie), "Number of nodes")
+        self.assertTrue(self.trie.remove("ashley"))
+        self.assertFalse("ashley" in self.trie, "Word should not be in trie")
+        self.assertFalse(self.trie.contains_prefix("ashl"))
+        self.assertEqual(10, len(self.trie), "Number of nodes")
+        self.assertEqual(4, self.trie.get_word_count(), "Word count not equal")
+        self.assertListEqual(["ash", "ashes", "asp"], sorted(self.trie.search("a*")))
+
+    def test_remove_inner_word(self):
+        self.assertTrue(self.trie.remove("ash"))
+        self.assertFalse("ash" in self.trie, "Word should not be in trie")
+        self.assertTrue("ashes" in self.trie, "Word should be in trie")
+        self.assertEqual(13, len(self.trie), "Number of nodes")
+
+    def test_remove_missing(self):
+        for word in ["as", "ashe", "cat", "", None]:
+            self.assertFalse(self.trie.remove(word))
+        self.assertEqual(13, len(self.trie), "Number of nodes")
+        self.assertEqual(5, self.trie.get_word_count(), "Word count not equal")
+
+    def test_remove_all(self):
+        for word in ["ash", "ashes", "ashley", "asp", "bat"]:
+            self.assertTrue(self.trie.remove(word))
+        self.assertEqual(1, len(self.trie), "Number of nodes")
+        self.assertEqual(0, self.trie.get_word_count(), "Word count not equal")
+        self.assertEqual(1, len(self.trie.freeze()), "Number of nodes")
+        self.trie.add("cat")
+        self.assertListEqual(["cat"], self.trie.search("*"))
+
+
+class TestCompactNodes(unittest.TestCase):
+
+    def test_children_layout(self):
+        node = CompactFSANode(0, "")
+        self.assertEqual(0, len(node.children))
+        letters = "abcdefghijklmnopqrstuvwxyz"[: MAX_ARRAY_CHILDREN + 1]
+        for i, letter in enumerate(letters, start=1):
+            node.add_child(letter, _id=i)
+            self.assertEqual(letters[:i], "".join(node.children))
+        self.assertIsInstance(node._targets, dict)
+        node.children["b"] = CompactFSANode(100, "b")
+        self.assertEqual(100, node["b"].id)
+        for letter in letters[1:]:
+            del node.children[letter]
+        self.assertEqual([("a", 1)], [(k, c.id) for k, c in node.children.items()])
+        self.assertIsNone(node.children.get("b"))
+        with self.assertRaises(KeyError):
+            del node.children["b"]
+
+    def test_same_results(self):
+        trie = Trie()
+        compact = Trie(compact=True)
+        for fsa in (trie, compact):
+            fsa.add_all(small_dataset)
+            fsa.remove("ashley")
+            fsa.add("ash", count=-1)
+        self.assertEqual(len(trie), len(compact))
+        self.assertEqual(trie.get_word_count(), compact.get_word_count())
+        for wildcard in ["a*", "?sh*", "*y"]:
+            self.assertEqual(trie.search(wildcard), compact.search(wildcard))
+        self.assertEqual(
+            trie.search_within_distance("ashly", dist=2),
+            compact.search_within_distance("ashly", dist=2),
+        )
+
+
+class TestWordIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie()
+        self.trie.add_all(["bat", "ash", "ashley", "ashes", "as", "ash"])
+
+    def test_index_of(self):
+        words = ["as", "ash", "ashes", "ashley", "bat"]
+        for i, word in enumerate(words):
+            self.assertEqual(i, self.trie.index_of(word))
+            self.assertEqual(word, self.trie.word_at(i))
+        self.assertEqual("bat", self.trie.word_at(-1))
+
+    def test_missing(self):
+        for word in ["a", "ashe", "cat", "", None]:
+            with self.assertRaises(ValueError):
+                self.trie.index_of(word)
+        for index in [5, -6]:
+            with self.assertRaises(IndexError):
+                self.trie.word_at(index)
+
+    def test_remove(self):
+        self.trie.remove("ash")
+        self.assertEqual(1, self.trie.index_of("ashes"))
+        self.assertEqual("bat", self.trie.word_at(3))
+
+
 class TestTriePrefixExists(unittest.TestCase):
 
     def test_trie_node_prefix_exists(self):
@@ -202,6 +310,48 @@ class TestTriePrefixSearch(unittest.TestCase):
         )
 
 
+class TestIterWords(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie()
+        self.trie.add_all(["tops", "tap", "top", "ta", "bat", "tapas", "to"])
+
+    def test_lex_order(self):
+        self.assertListEqual(
+            ["ta", "tap", "tapas", "to", "top", "tops"], list(self.trie.iter_words("t"))
+        )
+        self.assertListEqual(
+            ["tops", "top", "to", "tapas", "tap", "ta"],
+            list(self.trie.iter_words("t", reverse=True)),
+        )
+        self.assertListEqual(["bat"], list(self.trie.iter_words("b")))
+        self.assertListEqual([], list(self.trie.iter_words("x")))
+
+    def test_length_order(self):
+        self.assertListEqual(
+            ["ta", "to", "bat", "tap", "top", "tops", "tapas"],
+            list(self.trie.iter_words(order="length")),
+        )
+        self.assertListEqual(
+            [("tapas", 1), ("tops", 1), ("top", 1)],
+            list(self.trie.iter_words("t", "length", True, with_count=True))[:3],
+        )
+
+    def test_insertion_order(self):
+        self.assertListEqual(
+            self.trie.search_with_prefix("t"),
+            list(self.trie.iter_words("t", order="insertion")),
+        )
+        self.assertListEqual(
+            self.trie.search_with_prefix("t")[::-1],
+            list(self.trie.iter_words("t", order="insertion", reverse=True)),
+        )
+
+    def test_unknown_order(self):
+        with self.assertRaises(ValueError):
+            self.trie.iter_words(order="count")
+
+
 class TestWildCardSearch(unittest.TestCase):
 
     def test_trie_asterisk_search(self):
@@ -271,6 +421,260 @@ class TestWildCardSearch(unittest.TestCase):
         self.assertTrue("ashley" in self.trie, "Word should be in trie")
         self.assertTrue("#$%^a" in self.trie)
 
+    def test_trie_wildcard_no_duplicates(self):
+        self.trie = Trie()
+        self.trie.add_all(["aoo", "aoooo", "boa", "a.o", "a[o"])
+        self.assertListEqual(["aoo", "aoooo", "a.o", "a[o"], self.trie.search("a*o*"))
+        self.assertListEqual(["a.o"], self.trie.search("a.*"))
+        self.assertListEqual(["a[o"], self.trie.search("a[?"))
+
+    def test_trie_wildcard_cache(self):
+        self.trie = Trie()
+        self.trie.add_all(["ab", "as", "ash", "ashley"])
+        compile_wildcard.cache_clear()
+        self.trie.search("a*s**h?")
+        self.trie.search("a*s**h?")
+        self.assertEqual(1, compile_wildcard.cache_info().hits)
+        self.assertEqual(1, compile_wildcard.cache_info().misses)
+
+
+class TestRegexSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie()
+        self.trie.add_all(
+            ["tap", "taps", "top", "tops", "trip", "stop", "a1b", "a.b", "ash"]
+        )
+
+    def test_search_regex(self):
+        self.assertListEqual(
+            ["tap", "taps", "top", "tops"], self.trie.search_regex("t[ao]ps?")
+        )
+        self.assertListEqual(["trip"], self.trie.search_regex("t[^ao].{2}"))
+        self.assertListEqual(["top", "stop"], self.trie.search_regex(".*(?:to|st)p"))
+        self.assertListEqual(
+            ["taps", "tops", "trip"], self.trie.search_regex("t\\w{3}")
+        )
+        self.assertListEqual(["a1b"], self.trie.search_regex("a\\db"))
+        self.assertListEqual(["a.b"], self.trie.search_regex("^a\\.b$"))
+        self.assertListEqual(["stop", "ash"], self.trie.search_regex("ash|s.+"))
+        self.assertListEqual([], self.trie.search_regex("ta"))
+
+    def test_search_regex_with_count(self):
+        self.trie.add("tap", count=2)
+        self.assertListEqual(
+            [("tap", 3), ("top", 1)],
+            self.trie.search_regex("t.p", with_count=True),
+        )
+        self.assertListEqual(["top"], self.trie.search_regex("t.p", offset=1))
+
+    def test_invalid_regex(self):
+        for pattern in ["(ab", "*a", "[b-a]", "\\1", "(?=a)", "a{3,1}"]:
+            with self.assertRaises(InvalidRegularExpressionError):
+                self.trie.search_regex(pattern)
+
+
+class TestSuffixIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie()
+        self.trie.add_all(
+            ["nation", "action", "cat", "scatter", "catcat", "bat", "at", "a"]
+        )
+
+    def test_search_with_suffix(self):
+        self.assertListEqual(["action", "nation"], self.trie.search_with_suffix("tion"))
+        self.trie.build_suffix_index()
+        self.assertListEqual(["action", "nation"], self.trie.search_with_suffix("tion"))
+        self.assertListEqual(
+            ["at", "bat", "cat", "catcat"], self.trie.search_with_suffix("at")
+        )
+        self.assertListEqual([], self.trie.search_with_suffix("xion"))
+
+    def test_search_with_substring(self):
+        expected = ["cat", "catcat", "scatter"]
+        self.assertListEqual(expected, self.trie.search_with_substring("cat"))
+        self.trie.build_suffix_index()
+        self.assertListEqual(expected, self.trie.search_with_substring("cat"))
+        self.assertListEqual(
+            [("catcat", 1), ("scatter", 1)],
+            self.trie.search_with_substring("cat", with_count=True, offset=1),
+        )
+
+    def test_search_leading_wildcard(self):
+        patterns = ["*tion", "*cat*", "*a?t*", "*at", "*c*t", "*?at", "*??a", "*"]
+        expected = {p: self.trie.search(p) for p in patterns}
+        self.trie.build_suffix_index()
+        for pattern in patterns:
+            self.assertListEqual(expected[pattern], self.trie.search(pattern))
+        self.assertListEqual(["nation", "action"], self.trie.search("*tion"))
+        self.assertListEqual(
+            [("at", 1), ("cat", 1), ("catcat", 1), ("bat", 1)],
+            self.trie.search("*?at", with_count=True),
+        )
+        self.assertListEqual([], self.trie.search("**?a"))
+
+    def test_search_page_with_index(self):
+        self.trie.add_all(["royal", "alpha", "tally", "salt", "pal", "dial", "also"])
+        expected = self.trie.search("*al*", limit=3, offset=2)
+        self.trie.build_suffix_index()
+        self.assertListEqual(expected, self.trie.search("*al*", limit=3, offset=2))
+        self.assertListEqual(["salt", "royal", "tally"], expected)
+
+    def test_index_follows_updates(self):
+        self.trie.build_suffix_index()
+        self.trie.add("station")
+        self.trie.add("cat", count=2)
+        self.trie.remove("action")
+        self.assertListEqual(["nation", "station"], self.trie.search("*tion"))
+        self.assertListEqual(
+            [("cat", 3), ("catcat", 1)], self.trie.search_with_suffix("cat", True)
+        )
+        self.trie.drop_suffix_index()
+        self.assertListEqual(["nation", "station"], self.trie.search("*tion"))
+
+
+class TestIterSearch(unittest.TestCase):
+
+    def test_iter_search_is_lazy(self):
+        self.trie = Trie()
+        self.trie.add_all(["ash", "ashley", "ashes", "asp"])
+        words = self.trie.iter_search("as*")
+        self.assertEqual("ash", next(words))
+        self.assertEqual("ashley", next(words))
+        self.assertListEqual(["ashes", "asp"], list(words))
+
+    def test_iter_search_with_count(self):
+        self.trie = Trie()
+        self.trie.add_all(["ash", "ashley", "ashes", "ashes"])
+        self.assertListEqual(
+            [("ashes", 2), ("ash", 1)],
+            list(self.trie.iter_search("ash*s", with_count=True))
+            + list(self.trie.iter_search("as?", with_count=True)),
+        )
+
+    def test_iter_search_empty_pattern(self):
+        self.trie = Trie()
+        self.trie.add_all(["ash"])
+        self.assertListEqual([], list(self.trie.iter_search("")))
+
+    def test_search_long_word(self):
+        self.trie = Trie()
+        word = "a" * 50000
+        self.trie.add(word)
+        self.assertListEqual([word], self.trie.search("a*"))
+        self.assertListEqual([word], self.trie.search("*a"))
+        self.assertListEqual([word], self.trie.search_with_prefix("aaa"))
+
+
+class TestLimitOffset(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie()
+        self.trie.add_all(["ash", "ashley", "ashes", "asp", "ask", "arm"])
+
+    def test_search_limit(self):
+        self.assertListEqual(["ash", "ashley"], self.trie.search("as*", limit=2))
+        self.assertListEqual(
+            ["ashes", "asp"], self.trie.search("as*", limit=2, offset=2)
+        )
+        self.assertListEqual([], self.trie.search("as*", limit=0))
+
+    def test_search_with_prefix_limit(self):
+        self.assertListEqual(
+            [("ash", 1)], self.trie.search_with_prefix("a", with_count=True, limit=1)
+        )
+        self.assertListEqual(
+            ["asp", "ask"], self.trie.search_with_prefix("as", offset=3)
+        )
+
+    def test_search_within_distance_limit(self):
+        self.assertListEqual(
+            ["ash", "asp", "ask"], self.trie.search_within_distance("asx", dist=1)
+        )
+        self.assertListEqual(
+            ["asp"], self.trie.search_within_distance("asx", dist=1, limit=1, offset=1)
+        )
+
+    def test_negative_limit(self):
+        with self.assertRaises(ValueError):
+            self.trie.search("as*", limit=-1)
+        with self.assertRaises(ValueError):
+            self.trie.search_with_prefix("as", offset=-1)
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie()
+        self.trie.add_all(["ash", "ashes", "ashley", "bash"])
+        self.trie.enable_query_cache(maxsize=2)
+
+    def test_cache_hits(self):
+        self.assertListEqual(["ashley"], self.trie.search("*sh?e*"))
+        words = self.trie.search("*sh?e*")
+        words.append("cash")
+        self.assertListEqual(["ashley"], self.trie.search("*sh?e*"))
+        self.assertListEqual(
+            [("ashes", 1), ("ashley", 1)],
+            self.trie.search_with_prefix("ashe", with_count=True)
+            + self.trie.search_with_prefix("ashl", with_count=True),
+        )
+        self.assertListEqual(
+            ["ash", "bash"],
+            self.trie.search_within_distance("cash", 1, costs={"delete": 0.5}),
+        )
+        self.assertEqual((2, 4, 2, 2), tuple(self.trie.query_cache_info()))
+
+    def test_cache_invalidation(self):
+        self.assertListEqual(
+            ["ash", "ashes", "ashley"], self.trie.search_with_prefix("as")
+        )
+        self.trie.add("asp")
+        self.assertListEqual(
+            ["ash", "ashes", "ashley", "asp"], self.trie.search_with_prefix("as")
+        )
+        self.trie.add("asp", count=-1)
+        self.assertListEqual(
+            ["ash", "ashes", "ashley"], self.trie.search_with_prefix("as")
+        )
+        self.assertEqual(0, self.trie.query_cache_info().hits)
+        self.trie.disable_query_cache()
+        self.assertIsNone(self.trie.query_cache_info())
+
+
+class TestBatchQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = Trie()
+        self.trie.add_all(["ash", "ashley", "ashes", "asp", "bat"])
+
+    def test_contains_many(self):
+        words = ["ashes", "as", "bat", "ash", None, "", "ashleys", "ash", "cat"]
+        self.assertListEqual(
+            [word in self.trie for word in words], self.trie.contains_many(words)
+        )
+        self.assertListEqual([], self.trie.contains_many([]))
+
+    def test_contains_many_generator(self):
+        words = (word for word in ["bat", "ba", "asp"])
+        self.assertListEqual([True, False, True], self.trie.contains_many(words))
+
+    def test_search_many(self):
+        self.assertListEqual(
+            [["ash", "ashley", "ashes"], ["ash", "asp"], ["ash", "ashley", "ashes"]],
+            self.trie.search_many(["ash*", "as?", "ash*"]),
+        )
+        self.assertListEqual(
+            [[("bat", 1)], []], self.trie.search_many(["b*", "c*"], with_count=True)
+        )
+
+    def test_search_within_distance_many(self):
+        self.assertListEqual(
+            [["ash", "asp"], ["bat"]],
+            self.trie.search_within_distance_many(["asx", "bet"], dist=1),
+        )
+
 
 class TestBuildFromFile(unittest.TestCase):
 
@@ -296,5 +700,72 @@ class TestBuildFromFile(unittest.TestCase):
         self.assertEqual(8, self.trie.get_word_count(), "Word count not equal")
 
 
+class TestCompressedSources(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with open(small_dataset, "rb") as infile:
+            self.data = infile.read()
+        self.expected = Trie()
+        self.expected.add_all(small_dataset)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, opener=open):
+        path = os.path.join(self.tmpdir.name, name)
+        with opener(path, "wb") as out:
+            out.write(self.data)
+        return path
+
+    def assert_same_words(self, trie):
+        self.assertListEqual(
+            sorted(self.expected.search("*", with_count=True)),
+            sorted(trie.search("*", with_count=True)),
+        )
+
+    def test_compressed_files(self):
+        for name, opener in [
+            ("words.txt.gz", gzip.open),
+            ("words.txt.bz2", bz2.open),
+            ("words.txt.xz", lzma.open),
+            ("words.dat", gzip.open),  # detected by its magic number
+        ]:
+            path = self.write(name, opener)
+            self.assert_same_words(build_trie_from_file(path))
+            trie = Trie()
+            trie.add_all(path)
+            self.assert_same_words(trie)
+
+    def test_glob_and_list(self):
+        first = self.write("part-0.txt.gz", gzip.open)
+        second = self.write("part-1.txt")
+        trie = build_trie_from_file(os.path.join(self.tmpdir.name, "part-*"))
+        self.assertEqual(16, trie.get_word_count(), "Word count not equal")
+        trie = build_trie_from_file([first, second])
+        self.assertEqual(16, trie.get_word_count(), "Word count not equal")
+        with open(second, "rb") as infile:
+            trie = build_trie_from_file((first, infile))
+        self.assertEqual(16, trie.get_word_count(), "Word count not equal")
+
+    @unittest.skipIf(
+        importlib.util.find_spec("zstandard")
+        or importlib.util.find_spec("compression"),
+        "zstd support is installed",
+    )
+    def test_zstd_without_package(self):
+        path = os.path.join(self.tmpdir.name, "words.txt.zst")
+        with open(path, "wb") as out:
+            out.write(b"\x28\xb5\x2f\xfd")
+        with self.assertRaises(ImportError):
+            build_trie_from_file(path)
+
+    def test_missing_file(self):
+        with self.assertRaises(IOError):
+            build_trie_from_file(os.path.join(self.tmpdir.name, "missing-*.txt"))
+        with self.assertRaises(IOError):
+            Trie().add_all(os.path.join(self.tmpdir.name, "missing.txt"))
+
+
 if __name__ == "__main__":
     unittest.main()
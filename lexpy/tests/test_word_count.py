@@ -1,5 +1,6 @@
 import unittest
 import os
+import tempfile
 
 from lexpy import Trie, DAWG
 
@@ -20,6 +21,78 @@ class TestTrieWordCount(unittest.TestCase):
         expected = ["ash", "ashley", "ashes"]
         self.assertListEqual(expected, trie.search("a*"))
 
+    def test_decrement_count(self):
+        trie = Trie()
+        trie.add_all(["ash", "ashley", "ashes", "ashes"])
+        trie.add("ashes", count=5)
+        trie.add("ashes", count=-4)
+        self.assertListEqual([("ashes", 3)], trie.search("ashes", with_count=True))
+        self.assertEqual(5, trie.get_word_count(), "Word count not equal")
+        self.assertListEqual(
+            [("ashes", 3)], trie.top_k_with_prefix("a", 1, with_count=True)
+        )
+        trie.add("ashes", count=-10)
+        self.assertFalse("ashes" in trie, "Word should not be in trie")
+        self.assertEqual(2, trie.get_word_count(), "Word count not equal")
+        self.assertEqual(7, len(trie), "Number of nodes")
+        trie.add("cat", count=-1)
+        self.assertFalse("cat" in trie, "Word should not be in trie")
+        self.assertEqual(7, len(trie), "Number of nodes")
+
+
+class TestAddAllWithCount(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "counts.tsv")
+        with open(self.path, "wb") as out:
+            out.write(b"ash\t4\r\nashes\t9\nash\t2\n\nbat\t20\nsp\xc3\xa4t")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_trie_file_with_count(self):
+        trie = Trie()
+        trie.add_all(self.path, with_count=True)
+        self.assertListEqual(
+            [("ash", 6), ("ashes", 9), ("bat", 20), ("sp\xe4t", 1)],
+            sorted(trie.search("*", with_count=True)),
+        )
+        self.assertEqual(36, trie.get_word_count(), "Word count not equal")
+        self.assertListEqual(
+            [("bat", 20)], trie.top_k_with_prefix("", 1, with_count=True)
+        )
+
+    def test_trie_binary_file(self):
+        trie = Trie()
+        with open(self.path, "rb") as input_file:
+            trie.add_all(input_file, with_count=True)
+        self.assertEqual(36, trie.get_word_count(), "Word count not equal")
+
+    def test_trie_pairs(self):
+        trie = Trie()
+        pairs = [("ash", 3), ("bat", 2), ("ash", -1), ("cat", -1)]
+        trie.add_all(pairs, with_count=True)
+        self.assertListEqual(
+            [("ash", 2), ("bat", 2)], sorted(trie.search("*", with_count=True))
+        )
+        self.assertEqual(7, len(trie), "Number of nodes")
+
+    def test_dawg_file_with_count(self):
+        dawg = DAWG()
+        dawg.add_all(self.path, with_count=True, sort=True)
+        dawg.reduce()
+        self.assertListEqual(
+            [("ash", 6), ("ashes", 9), ("bat", 20), ("sp\xe4t", 1)],
+            dawg.search("*", with_count=True),
+        )
+
+    def test_invalid_count(self):
+        with open(self.path, "w") as out:
+            out.write("ash\tmany\n")
+        with self.assertRaises(ValueError):
+            Trie().add_all(self.path, with_count=True)
+
 
 class TestDAWGWordCount(unittest.TestCase):
 
@@ -36,3 +109,68 @@ class TestDAWGWordCount(unittest.TestCase):
         d.reduce()
         expected = ["ash", "ashes", "ashley"]
         self.assertListEqual(expected, d.search("a*"))
+
+    def test_decrement_count(self):
+        d = DAWG()
+        d.add_all(["ash", "ashes", "ashes", "ashley", "bash", "bashes"])
+        d.add("bashes", count=2)
+        d.add("bashes", count=-1)
+        d.reduce()
+        self.assertListEqual(
+            [("bash", 1), ("bashes", 2)], d.search("b*", with_count=True)
+        )
+        # 'ashes' and 'bashes' have the same count, they share the 'es' suffix
+        self.assertEqual(12, len(d), "Number of nodes")
+        d.add("ashes", count=-2)
+        self.assertListEqual(
+            [("ash", 1), ("ashley", 1)], d.search("a*", with_count=True)
+        )
+        self.assertListEqual(
+            [("bash", 1), ("bashes", 2)], d.search("b*", with_count=True)
+        )
+        self.assertEqual(5, d.get_word_count(), "Word count not equal")
+        self.assertEqual(len(d.freeze()) - 1, len(d), "Number of nodes")
+
+
+class TestTopKWithPrefix(unittest.TestCase):
+
+    def setUp(self):
+        self.counts = {"ash": 4, "ashes": 9, "ashley": 1, "asp": 7, "bat": 20}
+
+    def test_trie_top_k(self):
+        trie = Trie()
+        for word, count in self.counts.items():
+            trie.add(word, count=count)
+        self.assertListEqual(["ashes", "asp"], trie.top_k_with_prefix("as", 2))
+        self.assertListEqual(
+            [("ashes", 9), ("ash", 4), ("ashley", 1)],
+            trie.top_k_with_prefix("ash", 5, with_count=True),
+        )
+        self.assertListEqual(
+            [("bat", 20)], trie.top_k_with_prefix("", 1, with_count=True)
+        )
+        self.assertListEqual([], trie.top_k_with_prefix("x", 3))
+
+    def test_trie_top_k_after_increment(self):
+        trie = Trie()
+        for word, count in self.counts.items():
+            trie.add(word, count=count)
+        trie.add("ashley", count=10)
+        self.assertListEqual(
+            [("ashley", 11), ("ashes", 9)],
+            trie.top_k_with_prefix("a", 2, with_count=True),
+        )
+
+    def test_dawg_top_k(self):
+        dawg = DAWG()
+        for word in sorted(self.counts):
+            dawg.add(word, count=self.counts[word])
+        dawg.reduce()
+        self.assertListEqual(
+            [("bat", 20), ("ashes", 9), ("asp", 7)],
+            dawg.top_k_with_prefix("", 3, with_count=True),
+        )
+        self.assertListEqual(["ash", "ashley"], dawg.top_k_with_prefix("ash", 3)[1:])
+        self.assertListEqual(
+            dawg.top_k_with_prefix("as", 3), dawg.freeze().top_k_with_prefix("as", 3)
+        )
@@ -1,4 +1,4 @@
-from lexpy._base.node import FSANode
+from lexpy._base.node import CompactFSANode, FSANode
 from lexpy._base.automata import FSA
 
 __all__ = ["Trie"]
@@ -6,9 +6,9 @@ __all__ = ["Trie"]
 
 class Trie(FSA):
 
-    __slots__ = "root"
+    __slots__ = "root", "_num_of_nodes"
 
-    def __init__(self):
+    def __init__(self, compact=False):
         """Initialize a Trie
 
         Description:
@@ -17,9 +17,15 @@ class Trie(FSA):
             the Trie is also 1.
 
             The label of the root node is an empty string ''
+
+        Args:
+            compact (bool): Store the children of every node in arrays
+                instead of a dict. This uses less memory and makes lookups
+                slower. Default is False.
         """
-        root = FSANode(0, "")
+        root = (CompactFSANode if compact else FSANode)(0, "")
         super(Trie, self).__init__(root)
+        self._num_of_nodes = 1
 
     def __len__(self):
         """Returns the number of nodes in the Trie
@@ -27,13 +33,15 @@ class Trie(FSA):
         Returns:
             length (int) -> Number of Nodes in the trie data structure
         """
-        return self._id
+        return self._num_of_nodes
 
     def add(self, word: str, count: int = 1):
         """Adds a word in the trie
 
         Description:
-            Add a word and optionally specify the count
+            Add a word and optionally specify the count. A negative count is
+            subtracted from the count of the word, which is removed when its
+            count drops to zero.
 
         Args:
             word (str) : The word that you want to insert in the trie.
@@ -46,13 +54,117 @@ class Trie(FSA):
         if word is None:
             raise ValueError("Input word cannot be None")
 
+        if count < 0:
+            self._discount(word, -count)
+            return
+
+        self._version += 1
         node = self.root
-        for i, letter in enumerate(word):
+        path = [node]
+        for letter in word:
             if letter not in node.children:
                 self._id += 1
+                self._num_of_nodes += 1
                 node.add_child(letter, _id=self._id)
             node = node[letter]
-            if i == len(word) - 1:
+            path.append(node)
+
+        if word:
+            if not node.eow:
+                for path_node in path:
+                    path_node.num_of_words += 1
+                if self._suffix_index is not None:
+                    self._suffix_index.add(word)
+            node.eow = True
+            node.count += count
+            self._num_of_words += count
+            for path_node in path:
+                if path_node.max_count < node.count:
+                    path_node.max_count = node.count
+
+    def _discount(self, word, count=None):
+        """
+        Description:
+            Subtracts `count` from the count of `word`, or removes the word
+            if `count` is None or at least its count. Nodes left without a
+            word below them are deleted.
+
+        Returns:
+            :returns (bool) True if the word was in the trie
+        """
+        if not isinstance(word, str) or not word:
+            return False
+        node = self.root
+        path = [node]
+        for letter in word:
+            node = node.children.get(letter)
+            if node is None:
+                return False
+            path.append(node)
+        if not node.eow:
+            return False
+
+        self._version += 1
+        if count is None or count >= node.count:
+            count = node.count
+            node.eow = False
+            if self._suffix_index is not None:
+                self._suffix_index.remove(word)
+        node.count -= count
+        self._num_of_words -= count
+        for i in reversed(range(1, len(path))):
+            node = path[i]
+            if not node.eow and not node.children:
+                del path[i - 1].children[word[i - 1]]
+                self._num_of_nodes -= 1
+            else:
+                node.update_max_count()
+        self.root.update_max_count()
+        return True
+
+    def _add_words(self, pairs):
+        """
+        Description:
+            Inserts a batch of (word, count) pairs with the work of `add`
+            inlined in a single loop. Words which are not strings or have a
+            negative count go through `add`.
+        """
+        root = self.root
+        node_class = type(root)
+        num_of_nodes = 0
+        num_of_words = 0
+        suffix_index = self._suffix_index
+        self._version += 1
+        try:
+            for word, count in pairs:
+                if word.__class__ is not str or count < 0:
+                    self.add(word, count)
+                    continue
+                if not word:
+                    continue
+                node = root
+                path = [root]
+                for letter in word:
+                    children = node.children
+                    node = children.get(letter)
+                    if node is None:
+                        self._id += 1
+                        num_of_nodes += 1
+                        node = children[letter] = node_class(self._id, letter)
+                    path.append(node)
+                if not node.eow:
+                    for path_node in path:
+                        path_node.num_of_words += 1
+                    if suffix_index is not None:
+                        suffix_index.add(word)
                 node.eow = True
                 node.count += count
-                self._num_of_words += count
+                num_of_words += count
+                count = node.count
+                for path_node in reversed(path):
+                    if path_node.max_count >= count:
+                        break
+                    path_node.max_count = count
+        finally:
+            self._num_of_nodes += num_of_nodes
+            self._num_of_words += num_of_words
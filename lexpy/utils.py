@@ -1,16 +1,88 @@
 from lexpy.trie import Trie
 from lexpy.dawg import DAWG
+from lexpy._utils import gen_source
 
+QWERTY = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
 
-def _build_from_file(input_file, clazz):
+
+def _build_from_file(input_file, clazz, **kwargs):
     fsa = clazz()
-    fsa.add_all(input_file)
+    if isinstance(input_file, (list, tuple)):
+        input_file = gen_source(input_file, with_count=kwargs.get("with_count", False))
+    fsa.add_all(input_file, **kwargs)
     return fsa
 
 
-def build_dawg_from_file(input_file):
-    return _build_from_file(input_file, clazz=DAWG)
+def build_dawg_from_file(input_file, **kwargs):
+    """
+    Description:
+        Builds a DAWG from one or more files. `input_file` is a path, a glob
+        pattern, a file object or a list or tuple of them, and compressed
+        files are decompressed while they are read. The words should be in
+        alphabetical order across all the files unless `sort=True`.
+
+    Args:
+        :arg input_file (str, File, list, tuple) The input files
+        :arg kwargs Keyword arguments of `DAWG.add_all`, such as `with_count`
+        and `sort`
+
+    Returns:
+        :returns (DAWG) The DAWG, call `reduce()` before querying it
+    """
+    return _build_from_file(input_file, clazz=DAWG, **kwargs)
+
+
+def build_trie_from_file(input_file, **kwargs):
+    """
+    Description:
+        Builds a Trie from one or more files. `input_file` is a path, a glob
+        pattern, a file object or a list or tuple of them, and compressed
+        files are decompressed while they are read.
+
+    Args:
+        :arg input_file (str, File, list, tuple) The input files
+        :arg kwargs Keyword arguments of `Trie.add_all`, such as `with_count`
+
+    Returns:
+        :returns (Trie) The Trie
+    """
+    return _build_from_file(input_file, clazz=Trie, **kwargs)
+
+
+def keyboard_substitution_costs(cost=0.5, layout=QWERTY):
+    """
+    Description:
+        Returns substitution costs for `search_within_distance` where
+        substituting a letter with a neighbouring key of the keyboard costs
+        `cost` instead of 1. Every row of the layout is shifted half a key
+        to the right of the row above it.
+
+    Args:
+        :arg cost (float) Cost of substituting adjacent keys.
+        :arg layout (tuple) The rows of the keyboard from top to bottom.
 
+    Returns:
+        :returns (dict) Maps (letter, letter) pairs to `cost`, in both
+        directions and for lower and upper case letters.
 
-def build_trie_from_file(input_file):
-    return _build_from_file(input_file, clazz=Trie)
+    Example:
+        >>> from lexpy import Trie
+        >>> from lexpy.utils import keyboard_substitution_costs
+        >>> trie = Trie()
+        >>> trie.add_all(['cat', 'car', 'cut'])
+        >>> trie.search_within_distance(
+        ...     'cay', dist=0.5, substitution_costs=keyboard_substitution_costs()
+        ... )
+        ['cat']
+    """
+    costs = {}
+    for r, row in enumerate(layout):
+        for i, letter in enumerate(row):
+            neighbours = [(r, i + 1), (r + 1, i - 1), (r + 1, i)]
+            for nr, ni in neighbours:
+                if nr < len(layout) and 0 <= ni < len(layout[nr]):
+                    other = layout[nr][ni]
+                    for a, b in ((letter, other), (letter.upper(), other.upper())):
+                        costs[(a, b)] = cost
+                        costs[(b, a)] = cost
+    return costs
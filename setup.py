@@ -64,6 +64,7 @@ setup(
     packages=find_packages(exclude=("tests",)),
     package_dir={"lexpy": "lexpy"},
     include_package_data=True,
+    extras_require={"zstd": ["zstandard"]},
     classifiers=classifiers,
     keywords=keywords.split(),
 )